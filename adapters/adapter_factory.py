@@ -47,7 +47,7 @@ class AdapterFactory:
             return AdapterType.NAPCAT
         elif "llonebot" in platform_lower:
             return AdapterType.LLONEBOT
-        elif platform_lower in ["onebot"]:
+        elif platform_lower == "onebot":
             return AdapterType.NAPCAT  # onebot通常兼容napcat格式
         else:
             # 默认使用 aiocqhttp 适配器
@@ -6,7 +6,6 @@
 
 from typing import Any
 
-import astrbot.api.message_components as Comp
 from astrbot.api.event import MessageChain
 
 from .adapter_base import BaseAdapter
@@ -32,39 +31,10 @@ class AiocqhttpAdapter(BaseAdapter):
 
             # 构建原生字典格式的 Nodes
             # 避开 AstrBot Comp.Node 可能存在的序列化干扰 (如将图片转为 CQ 码)
-            forward_nodes = []
-
-            for msg in messages:
-                # 节点内容 (Message Segments)
-                node_content = []
-
-                # 1. 文本片段
-                text = msg.get("text") or msg.get("message_text")
-                if text:
-                    node_content.append({"type": "text", "data": {"text": str(text)}})
-
-                # 2. 图片片段
-                if msg.get("image_url"):
-                    node_content.append({
-                        "type": "image",
-                        "data": {
-                            "file": msg["image_url"]
-                        }
-                    })
-
-                # 3. 兜底
-                if not node_content:
-                    node_content.append({"type": "text", "data": {"text": "[空消息]"}})
-
-                # 包装为 Node
-                forward_nodes.append({
-                    "type": "node",
-                    "data": {
-                        "name": sender_name,
-                        "uin": int(sender_id), # 确保是整数
-                        "content": node_content
-                    }
-                })
+            uin = int(sender_id)  # 确保是整数，只需转换一次
+            forward_nodes = [
+                self.build_forward_node(msg, uin, sender_name) for msg in messages
+            ]
 
             if not forward_nodes:
                 return {"success": False, "error": "消息构建后为空"}
@@ -188,11 +158,11 @@ class AiocqhttpAdapter(BaseAdapter):
     def build_forward_node(
         self,
         message: dict[str, Any],
-        sender_id: str = "10000",
+        sender_id: str | int = "10000",
         sender_name: str = "媒体服务器",
     ) -> dict[str, Any]:
         """
-        构建单个转发节点（兼容方法）
+        构建单个转发节点
 
         Args:
             message: 消息内容字典
@@ -206,9 +176,9 @@ class AiocqhttpAdapter(BaseAdapter):
         content = []
 
         # 添加文本内容
-        if message.get("text") or message.get("message_text"):
-            text = message.get("text") or message.get("message_text")
-            content.append({"type": "text", "data": {"text": text}})
+        text = message.get("text") or message.get("message_text")
+        if text:
+            content.append({"type": "text", "data": {"text": str(text)}})
 
         # 添加图片内容
         if message.get("image_url"):
@@ -41,10 +41,10 @@ class LLOneBotAdapter(BaseAdapter):
             sender_id = kwargs.get("sender_id", "2659908767")
             sender_name = kwargs.get("sender_name", "媒体通知")
 
-            forward_nodes = []
-            for msg in valid_messages:
-                node = self.build_forward_node(msg, sender_id, sender_name)
-                forward_nodes.append(node)
+            forward_nodes = [
+                self.build_forward_node(msg, sender_id, sender_name)
+                for msg in valid_messages
+            ]
 
             # 使用 AstrBot 标准的 aiocqhttp call_action 方式
             if kwargs.get("user_id"):
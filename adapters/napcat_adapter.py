@@ -42,10 +42,10 @@ class NapCatAdapter(BaseAdapter):
             sender_id = kwargs.get("sender_id", "2659908767")
             sender_name = kwargs.get("sender_name", "媒体通知")
 
-            forward_nodes = []
-            for msg in valid_messages:
-                node = self.build_forward_node(msg, sender_id, sender_name)
-                forward_nodes.append(node)
+            forward_nodes = [
+                self.build_forward_node(msg, sender_id, sender_name)
+                for msg in valid_messages
+            ]
 
             # 构建 NapCat 格式的请求参数
             if kwargs.get("user_id"):
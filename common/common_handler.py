@@ -1,4 +1,3 @@
-import base64
 import json
 import random
 from pathlib import Path
@@ -6,6 +5,11 @@ from typing import Any
 
 from astrbot.api import logger
 
+from ..utils import json_utils
+from ..utils.image_utils import load_data_url
+
+_BG_SUFFIXES = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+
 
 class CommonHandler:
     """处理通用和扩展 Webhook (GitHub, DockerHub 等)"""
@@ -32,7 +36,7 @@ class CommonHandler:
 
             # 2. 尝试解析为 JSON
             try:
-                data = json.loads(body)
+                data = json_utils.loads(body)
             except json.JSONDecodeError:
                 # 纯文本处理
                 return {
@@ -69,24 +73,25 @@ class CommonHandler:
             }
 
         except Exception as e:
-            logger.error(f"通用 Webhook 处理失败: {e}")
+            logger.error("通用 Webhook 处理失败: %s", e)
             return None
 
     def _handle_github(self, body: str, headers: dict[str, str]) -> dict:
         event = headers.get("X-GitHub-Event", "unknown")
         try:
-            data = json.loads(body)
+            data = json_utils.loads(body)
             repo_name = data.get("repository", {}).get("full_name", "Unknown Repo")
             sender = data.get("sender", {}).get("login", "Unknown User")
 
             if event == "push":
-                ref = data.get("ref", "").split("/")[-1]
+                ref = data.get("ref", "").rpartition("/")[2]
                 commits = data.get("commits", [])
                 msg = f"GitHub推送 - {repo_name}\n"
                 msg += f"分支: {ref}\n"
                 msg += f"推送者: {sender}\n"
                 if commits:
-                    msg += f"摘要: {commits[0].get('message', '').splitlines()[0]}"
+                    summary = commits[0].get("message", "").partition("\n")[0]
+                    msg += f"摘要: {summary}"
                 return {
                     "message_text": msg,
                     "message_type": "common",
@@ -139,21 +144,22 @@ class CommonHandler:
         # 如果未识别到任何匹配项，则搜索以 'default' 开头的图片
         search_prefix = source.lower() if source else "default"
 
-        # 获取目录下所有匹配的文件
+        # 单次遍历目录，同时收集来源前缀与 default 前缀的图片
         matches = []
+        defaults = []
         try:
             for file in self.bg_resource_path.iterdir():
-                if file.suffix.lower() in [".jpg", ".jpeg", ".png", ".webp"]:
-                    # 匹配逻辑：文件名以来源名开头
-                    if file.name.lower().startswith(search_prefix):
-                        matches.append(file)
-
-            # 如果来源没有匹配到，或者来源原本就是 default，则尝试寻找 default 开头的图
-            if not matches and search_prefix != "default":
-                for file in self.bg_resource_path.iterdir():
-                    if file.suffix.lower() in [".jpg", ".jpeg", ".png", ".webp"]:
-                        if file.name.lower().startswith("default"):
-                            matches.append(file)
+                if file.suffix.lower() not in _BG_SUFFIXES:
+                    continue
+                name = file.name.lower()
+                # 匹配逻辑：文件名以来源名开头
+                if name.startswith(search_prefix):
+                    matches.append(file)
+                elif name.startswith("default"):
+                    defaults.append(file)
+
+            # 如果来源没有匹配到，则使用 default 开头的图
+            matches = matches or defaults
 
             if not matches:
                 return ""
@@ -161,15 +167,9 @@ class CommonHandler:
             # 随机选择一张
             selected_file = random.choice(matches)
 
-            # 读取并转为 base64
-            with open(selected_file, "rb") as f:
-                img_data = f.read()
-                b64 = base64.b64encode(img_data).decode()
-                ext = selected_file.suffix.lower().replace(".", "")
-                if ext == "jpg":
-                    ext = "jpeg"
-                return f"data:image/{ext};base64,{b64}"
+            # 读取并转为 base64，同一文件复用缓存的编码结果
+            return load_data_url(selected_file)
 
         except Exception as e:
-            logger.error(f"加载本地通用背景图失败: {e}")
+            logger.error("加载本地通用背景图失败: %s", e)
             return ""
@@ -1,10 +1,13 @@
-import base64
 import json
 import random
 from pathlib import Path
 
 from astrbot.api import logger
 
+from ..utils.image_utils import load_data_url
+
+_BG_SUFFIXES = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+
 
 class GameHandler:
     """游戏Webhook处理器"""
@@ -45,7 +48,7 @@ class GameHandler:
                 if ai_analysis:
                     message_text += f"\n\n🤖 AI 运行分析:\n{ai_analysis}"
             except Exception as e:
-                logger.error(f"AI 分析游戏推送失败: {e}")
+                logger.error("AI 分析游戏推送失败: %s", e)
 
         return {
             "status": "success",
@@ -65,21 +68,22 @@ class GameHandler:
         # 如果未识别到任何匹配项，则搜索以 'default' 开头的图片
         search_prefix = source.lower() if source else "default"
 
-        # 获取目录下所有匹配的文件
+        # 单次遍历目录，同时收集来源前缀与 default 前缀的图片
         matches = []
+        defaults = []
         try:
             for file in self.bg_resource_path.iterdir():
-                if file.suffix.lower() in [".jpg", ".jpeg", ".png", ".webp"]:
-                    # 匹配逻辑：文件名以来源名开头
-                    if file.name.lower().startswith(search_prefix):
-                        matches.append(file)
-
-            # 如果来源没有匹配到，或者来源原本就是 default，则尝试寻找 default 开头的图
-            if not matches and search_prefix != "default":
-                for file in self.bg_resource_path.iterdir():
-                    if file.suffix.lower() in [".jpg", ".jpeg", ".png", ".webp"]:
-                        if file.name.lower().startswith("default"):
-                            matches.append(file)
+                if file.suffix.lower() not in _BG_SUFFIXES:
+                    continue
+                name = file.name.lower()
+                # 匹配逻辑：文件名以来源名开头
+                if name.startswith(search_prefix):
+                    matches.append(file)
+                elif name.startswith("default"):
+                    defaults.append(file)
+
+            # 如果来源没有匹配到，则使用 default 开头的图
+            matches = matches or defaults
 
             if not matches:
                 return ""
@@ -87,17 +91,11 @@ class GameHandler:
             # 随机选择一张
             selected_file = random.choice(matches)
 
-            # 读取并转为 base64
-            with open(selected_file, "rb") as f:
-                img_data = f.read()
-                b64 = base64.b64encode(img_data).decode()
-                ext = selected_file.suffix.lower().replace(".", "")
-                if ext == "jpg":
-                    ext = "jpeg"
-                return f"data:image/{ext};base64,{b64}"
+            # 读取并转为 base64，同一文件复用缓存的编码结果
+            return load_data_url(selected_file)
 
         except Exception as e:
-            logger.error(f"加载本地游戏背景图失败: {e}")
+            logger.error("加载本地游戏背景图失败: %s", e)
             return ""
 
     async def _analyze_with_ai(self, payload: dict) -> str:
@@ -128,7 +126,7 @@ class GameHandler:
 
             return result
         except Exception as e:
-            logger.error(f"LLM 请求出错: {e}")
+            logger.error("LLM 请求出错: %s", e)
             return f"分析过程出错: {str(e)}"
 
     def detect_game_source(self, payload: dict, headers: dict = None) -> str:
@@ -3,6 +3,7 @@ import base64
 import json
 import time
 import uuid
+from collections import deque
 from pathlib import Path
 
 from aiohttp import web
@@ -18,6 +19,7 @@ from .adapters import AdapterFactory
 from .common import CommonHandler
 from .game import GameHandler
 from .media import MediaDataProcessor, MediaHandler
+from .utils import json_utils
 from .utils.browser import BrowserManager
 from .utils.html_renderer import HtmlRenderer
 
@@ -26,8 +28,22 @@ DEFAULT_SENDER_ID = "2659908767"
 DEFAULT_SENDER_NAME = "媒体通知"
 DEFAULT_WEBHOOK_PORT = 60071
 DEFAULT_BATCH_MIN_SIZE = 3
+DEFAULT_BATCH_CHUNK_SIZE = 20
 DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
 DEFAULT_BATCH_INTERVAL = 300
+DEFAULT_SEND_CONCURRENCY = 2
+DEFAULT_SEND_RATE_LIMIT = 2
+DEFAULT_PROCESS_CONCURRENCY = 5
+# 自动检测平台时的匹配顺序
+AUTO_DETECT_PLATFORMS = ("llonebot", "napcat", "aiocqhttp")
+# 可回退到 aiocqhttp 传输层的 OneBot 实现
+ONEBOT_TRANSPORT_FALLBACK = frozenset({"llonebot", "napcat"})
+# 媒体来源识别需要随原始数据入队保存的请求头
+MEDIA_HEADER_KEYS = ("User-Agent", "Content-Type")
+# 监听套接字的连接等待队列长度，应对突发的并发推送
+SERVER_BACKLOG = 512
 
 
 class Main(Star):
@@ -43,17 +59,41 @@ class Main(Star):
         # 核心配置
         self.webhook_port = config.get("webhook_port", DEFAULT_WEBHOOK_PORT)
         self.group_id = config.get("group_id", "")
+        # 发送时使用的群组 ID (":" 替换为 "_")，配置加载时计算一次
+        self.target_group_id = str(self.group_id).replace(":", "_")
+        # 单条发送使用的会话标识缓存: (平台名, origin)
+        self._group_origin: tuple[str, str] | None = None
         self.platform_name = config.get("platform_name", "auto")
+        # 自动检测到的平台名，命中已知协议后缓存，避免每次发送重复遍历平台实例
+        self._detected_platform: str | None = None
         self.batch_min_size = config.get("batch_min_size", DEFAULT_BATCH_MIN_SIZE)
+        self.batch_chunk_size = max(
+            self.batch_min_size,
+            config.get("batch_chunk_size", DEFAULT_BATCH_CHUNK_SIZE),
+        )
         self.batch_interval_seconds = config.get(
             "batch_interval_seconds", DEFAULT_BATCH_INTERVAL
         )
+        self.dedup_enabled = config.get("dedup_enabled", True)
         self.cache_ttl_seconds = config.get("cache_ttl_seconds", DEFAULT_CACHE_TTL)
+        self.cache_max_entries = config.get(
+            "cache_max_entries", DEFAULT_CACHE_MAX_ENTRIES
+        )
+        self.send_concurrency = max(
+            1, config.get("send_concurrency", DEFAULT_SEND_CONCURRENCY)
+        )
+        self.send_rate_limit = max(
+            1, config.get("send_rate_limit", DEFAULT_SEND_RATE_LIMIT)
+        )
+        self.process_concurrency = max(
+            1, config.get("process_concurrency", DEFAULT_PROCESS_CONCURRENCY)
+        )
 
         # 适配器配置
         self.sender_id = config.get("sender_id", DEFAULT_SENDER_ID)
         self.sender_name = config.get("sender_name", DEFAULT_SENDER_NAME)
         self.webhook_token = config.get("webhook_token", "")
+        self.max_body_size = config.get("max_body_size", DEFAULT_MAX_BODY_SIZE)
 
         # 路由配置
         self.media_routes = self._parse_routes(
@@ -102,18 +142,26 @@ class Main(Star):
         try:
             self.media_handler = MediaHandler(enrichment_config)
             self.data_processor = MediaDataProcessor(
-                self.media_handler, self.cache_ttl_seconds
+                self.media_handler,
+                self.cache_ttl_seconds,
+                self.cache_max_entries,
+                self.dedup_enabled,
             )
             self.game_handler = GameHandler(self.context, config)
             self.common_handler = CommonHandler(config)
             self.image_renderer = HtmlRenderer(base_data_path)
         except Exception as e:
-            logger.error(f"初始化处理器失败: {e}")
+            logger.error("初始化处理器失败: %s", e)
             raise
 
         # 初始化运行时数据
-        self.message_queue: list[dict] = []
+        self.message_queue: deque[dict] = deque()
         self.last_batch_time = time.time()
+        # 单条发送限流：最近 1 秒内的发送时间戳
+        self._send_semaphore = asyncio.Semaphore(self.send_concurrency)
+        self._send_timestamps: deque[float] = deque()
+        # 队列达到合并转发阈值时立即触发处理，无需等待下一个周期
+        self._drain_event = asyncio.Event()
 
         # HTTP 服务器组件
         self.app = None
@@ -135,7 +183,7 @@ class Main(Star):
             saved_queue = await self.get_kv_data("persistent_msg_queue", [])
             if saved_queue:
                 self.message_queue.extend(saved_queue)
-                logger.info(f"已恢复 {len(saved_queue)} 条未处理消息")
+                logger.info("已恢复 %s 条未处理消息", len(saved_queue))
 
             logger.info("准备进行浏览器环境自检...")
             await BrowserManager.init()
@@ -145,19 +193,21 @@ class Main(Star):
             )
             logger.info("[OK] 插件初始化完成 - 所有模块已启用")
         except Exception as e:
-            logger.error(f"插件初始化失败: {e}", exc_info=True)
+            logger.error("插件初始化失败: %s", e, exc_info=True)
 
     async def _save_queue(self):
         """持久化队列到 KV"""
         try:
-            await self.put_kv_data("persistent_msg_queue", self.message_queue)
+            await self.put_kv_data("persistent_msg_queue", list(self.message_queue))
         except Exception as e:
-            logger.error(f"保存队列失败: {e}")
+            logger.error("保存队列失败: %s", e)
 
     async def _enqueue(self, msg: dict):
         """入队并保存"""
         self.message_queue.append(msg)
         await self._save_queue()
+        if len(self.message_queue) >= self.batch_min_size:
+            self._drain_event.set()
 
     def _validate_config(self):
         """验证配置参数"""
@@ -187,32 +237,35 @@ class Main(Star):
                 self.app.router.add_post(
                     self._normalize_route(route), self.handle_media_webhook
                 )
-                logger.info(f"注册媒体Webhook路由: POST {route}")
+                logger.info("注册媒体Webhook路由: POST %s", route)
 
             # 注册游戏相关路由
             for route in self.game_routes:
                 self.app.router.add_post(
                     self._normalize_route(route), self.handle_game_webhook
                 )
-                logger.info(f"注册游戏Webhook路由: POST {route}")
+                logger.info("注册游戏Webhook路由: POST %s", route)
 
             # 注册通用路由
             for route in self.common_routes:
                 self.app.router.add_post(
                     self._normalize_route(route), self.handle_common_webhook
                 )
-                logger.info(f"注册通用Webhook路由: POST {route}")
+                logger.info("注册通用Webhook路由: POST %s", route)
 
             self.app.router.add_get("/status", self.handle_status)
 
-            self.runner = web.AppRunner(self.app)
+            # 各处理方法已记录请求日志，关闭 aiohttp 自带的访问日志
+            self.runner = web.AppRunner(self.app, access_log=None)
             await self.runner.setup()
-            self.site = web.TCPSite(self.runner, "0.0.0.0", self.webhook_port)
+            self.site = web.TCPSite(
+                self.runner, "0.0.0.0", self.webhook_port, backlog=SERVER_BACKLOG
+            )
             await self.site.start()
 
-            logger.info(f"Webhook 服务器已启动在端口 {self.webhook_port}")
+            logger.info("Webhook 服务器已启动在端口 %s", self.webhook_port)
         except Exception as e:
-            logger.error(f"启动 Webhook 服务器失败: {e}")
+            logger.error("启动 Webhook 服务器失败: %s", e)
             raise
 
     def _check_auth(self, request: Request) -> bool:
@@ -222,6 +275,18 @@ class Main(Star):
         token = request.headers.get("X-Webhook-Token")
         return token == self.webhook_token
 
+    async def _read_body(self, request: Request) -> str | None:
+        """读取请求体，超过大小上限时返回 None"""
+        if request.content_length and request.content_length > self.max_body_size:
+            return None
+        # 分块读取，未声明长度的请求超过上限时也能立即中止
+        raw = bytearray()
+        async for chunk in request.content.iter_chunked(64 * 1024):
+            raw += chunk
+            if len(raw) > self.max_body_size:
+                return None
+        return raw.decode(request.charset or "utf-8", "replace")
+
     def _normalize_route(self, route: str) -> str:
         if not route.startswith("/"):
             return "/" + route
@@ -231,10 +296,16 @@ class Main(Star):
         """启动批量处理器周期任务"""
         while True:
             try:
-                await asyncio.sleep(self.batch_interval_seconds)
+                try:
+                    await asyncio.wait_for(
+                        self._drain_event.wait(), timeout=self.batch_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._drain_event.clear()
                 await self.process_message_queue()
             except Exception as e:
-                logger.error(f"批量处理器出错: {e}")
+                logger.error("批量处理器出错: %s", e)
                 await asyncio.sleep(10)
 
     # --- Webhook 处理方法 (只负责分流) ---
@@ -243,12 +314,25 @@ class Main(Star):
         """处理媒体相关 Webhook 请求"""
         trace_id = str(uuid.uuid4())[:8]
         if not self._check_auth(request):
-            logger.warning(f"[{trace_id}] 未授权: {request.remote}")
+            logger.warning("[%s] 未授权: %s", trace_id, request.remote)
             return Response(text="Unauthorized", status=401)
         try:
-            body_text = await request.text()
-            headers = dict(request.headers)
-            logger.info(f"[{trace_id}][媒体Webhook] 收到 Webhook 请求: {request.path}")
+            body_text = await self._read_body(request)
+            if body_text is None:
+                logger.warning("[%s] 请求体过大: %s", trace_id, request.content_length)
+                return Response(text="Payload Too Large", status=413)
+            if not body_text:
+                return Response(text="请求体为空", status=400)
+            # 队列需持久化为 JSON，只保留来源识别所需的请求头
+            headers = {
+                k: request.headers[k] for k in MEDIA_HEADER_KEYS if k in request.headers
+            }
+            logger.info(
+                "[%s][媒体Webhook] 收到 Webhook 请求: %s (%s 字符)",
+                trace_id,
+                request.path,
+                len(body_text),
+            )
 
             # 加入队列，标记为需要媒体检测
             raw_payload = {
@@ -262,21 +346,32 @@ class Main(Star):
             await self._enqueue(raw_payload)
             return Response(text=f"已加入队列 (ID: {trace_id})", status=200)
         except Exception as e:
-            logger.error(f"[{trace_id}] Webhook 处理出错: {e}")
+            logger.error("[%s] Webhook 处理出错: %s", trace_id, e)
             return Response(text="Internal Error", status=500)
 
     async def handle_game_webhook(self, request: Request) -> Response:
         """处理游戏相关 Webhook 请求"""
         trace_id = str(uuid.uuid4())[:8]
         if not self._check_auth(request):
-            logger.warning(f"[{trace_id}] 未授权: {request.remote}")
+            logger.warning("[%s] 未授权: %s", trace_id, request.remote)
             return Response(text="Unauthorized", status=401)
         try:
-            body_text = await request.text()
-            headers = dict(request.headers)
-            logger.info(f"[{trace_id}][游戏Webhook] 收到 Webhook 请求: {request.path}")
+            body_text = await self._read_body(request)
+            if body_text is None:
+                logger.warning("[%s] 请求体过大: %s", trace_id, request.content_length)
+                return Response(text="Payload Too Large", status=413)
+            if not body_text:
+                return Response(text="请求体为空", status=400)
+            # 直接使用大小写不敏感的原始请求头，无需复制
+            headers = request.headers
+            logger.info(
+                "[%s][游戏Webhook] 收到 Webhook 请求: %s (%s 字符)",
+                trace_id,
+                request.path,
+                len(body_text),
+            )
 
-            payload = json.loads(body_text)
+            payload = json_utils.loads(body_text)
             result = await self.game_handler.process_game_webhook(payload, headers)
 
             if result and "message_text" in result:
@@ -289,19 +384,30 @@ class Main(Star):
 
             return Response(text="无效数据", status=400)
         except Exception as e:
-            logger.error(f"[{trace_id}] Webhook 处理出错: {e}")
+            logger.error("[%s] Webhook 处理出错: %s", trace_id, e)
             return Response(text="Internal Error", status=500)
 
     async def handle_common_webhook(self, request: Request) -> Response:
         """处理通用相关 Webhook 请求"""
         trace_id = str(uuid.uuid4())[:8]
         if not self._check_auth(request):
-            logger.warning(f"[{trace_id}] 未授权: {request.remote}")
+            logger.warning("[%s] 未授权: %s", trace_id, request.remote)
             return Response(text="Unauthorized", status=401)
         try:
-            body_text = await request.text()
-            headers = dict(request.headers)
-            logger.info(f"[{trace_id}][通用Webhook] 收到 Webhook 请求: {request.path}")
+            body_text = await self._read_body(request)
+            if body_text is None:
+                logger.warning("[%s] 请求体过大: %s", trace_id, request.content_length)
+                return Response(text="Payload Too Large", status=413)
+            if not body_text:
+                return Response(text="请求体为空", status=400)
+            # 直接使用大小写不敏感的原始请求头，无需复制
+            headers = request.headers
+            logger.info(
+                "[%s][通用Webhook] 收到 Webhook 请求: %s (%s 字符)",
+                trace_id,
+                request.path,
+                len(body_text),
+            )
 
             result = await self.common_handler.process_common_webhook(
                 body_text, headers
@@ -316,7 +422,7 @@ class Main(Star):
 
             return Response(text="无效数据", status=400)
         except Exception as e:
-            logger.error(f"[{trace_id}] Webhook 处理出错: {e}")
+            logger.error("[%s] Webhook 处理出错: %s", trace_id, e)
             return Response(text="Internal Error", status=500)
 
     async def handle_status(self, request: Request) -> Response:
@@ -340,28 +446,42 @@ class Main(Star):
         if not self.message_queue or not self.group_id:
             return
 
-        messages_to_process = self.message_queue.copy()
-        self.message_queue.clear()
+        # 直接换入新队列，避免复制并防止复制与清空之间新入队的消息丢失
+        messages_to_process, self.message_queue = self.message_queue, deque()
         await self._save_queue()
 
-        final_messages = []
-        for msg in messages_to_process:
+        # 媒体消息的数据富化以 I/O 为主，有限并发处理，结果保持入队顺序
+        # 元数据与图片查询只在此处发起，同时进行的外部查询数量也由该并发数限制
+        semaphore = asyncio.Semaphore(self.process_concurrency)
+
+        async def _prepare(msg: dict) -> dict | None:
+            if msg.get("message_type") != "raw_media":
+                # 已经是标准格式 (game 或 common)
+                return msg
             trace_id = msg.get("trace_id", "Unknown")
-            m_type = msg.get("message_type")
-            if m_type == "raw_media":
-                logger.debug(f"[{trace_id}] 开始处理媒体元数据...")
+            async with semaphore:
+                logger.debug("[%s] 开始处理媒体元数据...", trace_id)
                 # 交给媒体处理器进行识别和数据富化
                 processed = await self.data_processor.detect_and_process_raw_data(msg)
-                if processed:
-                    processed["trace_id"] = trace_id
-                    processed["template"] = msg.get("template", self.media_template)
-                    final_messages.append(processed)
-            else:
-                # 已经是标准格式 (game 或 common)
-                final_messages.append(msg)
+            if processed:
+                processed["trace_id"] = trace_id
+                processed["template"] = msg.get("template", self.media_template)
+            return processed
+
+        results = await asyncio.gather(
+            *(_prepare(msg) for msg in messages_to_process), return_exceptions=True
+        )
+        # 原始请求体已处理完毕，发送前释放，避免与渲染图片同时驻留内存
+        messages_to_process.clear()
+        final_messages = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("媒体消息处理失败: %s", result)
+            elif result:
+                final_messages.append(result)
 
         if final_messages:
-            logger.info(f"开始批量处理 {len(final_messages)} 条消息")
+            logger.info("开始批量处理 %s 条消息", len(final_messages))
             await self.send_intelligently(final_messages)
 
         self.last_batch_time = time.time()
@@ -369,10 +489,19 @@ class Main(Star):
     async def send_intelligently(self, messages: list):
         """智能发送逻辑"""
         count = len(messages)
-        if count >= self.batch_min_size:
-            await self.send_batch_messages(messages)
-        else:
+        if count < self.batch_min_size:
             await self.send_individual_messages(messages)
+            return
+
+        # 按分块大小拆成多条合并转发依次发送，保证群内通知顺序，
+        # 不足最小批量的尾块单独发送
+        size = self.batch_chunk_size
+        for i in range(0, count, size):
+            chunk = messages[i : i + size]
+            if len(chunk) >= self.batch_min_size:
+                await self.send_batch_messages(chunk)
+            else:
+                await self.send_individual_messages(chunk)
 
     async def send_batch_messages(self, messages: list):
         """批量发送 (渲染为多张合并转发图片)"""
@@ -380,23 +509,17 @@ class Main(Star):
             rendered_messages = []
             for msg in messages:
                 trace_id = msg.get("trace_id", "Unknown")
-                logger.info(f"[{trace_id}] 正在渲染")
-                # 使用 HtmlRenderer 异步渲染
-                img = await self.image_renderer.render(
-                    msg["message_text"],
-                    msg.get("poster_url") or msg.get("image_url"),
-                    template_name=msg.get("template", "card_default.html"),
-                )
+                img = await self._render_message(msg)
 
                 if img:
                     # 将图片转换为 base64:// 协议字符串，适配 OneBot 协议
                     base64_str = f"base64://{base64.b64encode(img).decode()}"
-                    logger.info(f"[{trace_id}] 图片转 Base64 成功，长度: {len(base64_str)}")
+                    logger.info("[%s] 图片转 Base64 成功，长度: %s", trace_id, len(base64_str))
+                    # 发送者信息由适配器统一传入，节点内只需图片
                     rendered_messages.append(
                         {
                             "message_text": "",  # 留空，只发送图片
                             "image_url": base64_str,  # 适配器期望的字段名是 image_url
-                            "sender_name": self.sender_name,
                         }
                     )
 
@@ -405,14 +528,17 @@ class Main(Star):
                 return
 
             effective_platform = self.get_effective_platform_name()
-            logger.info(f"配置/推断的协议适配器类型: {effective_platform}")
+            logger.info("配置/推断的协议适配器类型: %s", effective_platform)
 
             # 1. 尝试直接获取平台实例 (Transport Layer)
             platform_inst = self.context.get_platform_inst(effective_platform)
             
             # 2. 如果失败，尝试获取 'aiocqhttp' (这是大多数 OneBot 实现的通用 AstrBot 平台名)
-            if not platform_inst and effective_platform in ["llonebot", "napcat"]:
-                logger.info(f"未找到名为 {effective_platform} 的平台实例，尝试使用 'aiocqhttp' 作为传输层...")
+            if not platform_inst and effective_platform in ONEBOT_TRANSPORT_FALLBACK:
+                logger.info(
+                    "未找到名为 %s 的平台实例，尝试使用 'aiocqhttp' 作为传输层...",
+                    effective_platform,
+                )
                 platform_inst = self.context.get_platform_inst("aiocqhttp")
 
             # 3. 如果还是失败，尝试使用第一个可用平台
@@ -420,57 +546,108 @@ class Main(Star):
                 insts = self.context.platform_manager.platform_insts
                 if insts:
                     fallback_id = insts[0].meta().id
-                    logger.warning(f"指定/推断的平台 {effective_platform} 未加载，回退到第一个可用平台: {fallback_id}")
+                    logger.warning(
+                        "指定/推断的平台 %s 未加载，回退到第一个可用平台: %s",
+                        effective_platform,
+                        fallback_id,
+                    )
                     platform_inst = insts[0]
 
             bot = platform_inst.get_client() if platform_inst else None
             if not bot:
-                logger.error(f"无法获取任何可用的 Bot 实例，取消发送")
+                logger.error("无法获取任何可用的 Bot 实例，取消发送")
                 return
 
             logger.info("正在创建适配器...")
             adapter = AdapterFactory.create_adapter(effective_platform)
-            logger.info(f"适配器 {type(adapter).__name__} 创建成功，开始发送...")
+            logger.info("适配器 %s 创建成功，开始发送...", type(adapter).__name__)
             
             result = await adapter.send_forward_messages(
                 bot_client=bot,
-                group_id=str(self.group_id).replace(":", "_"),
+                group_id=self.target_group_id,
                 messages=rendered_messages,
                 sender_id=self.sender_id,
                 sender_name=self.sender_name,
             )
-            logger.info(f"发送结果: {result}")
+            logger.info("发送结果: %s", result)
         except Exception as e:
-            logger.error(f"批量发送失败，回退到单独发送: {e}")
+            logger.error("批量发送失败，回退到单独发送: %s", e)
             await self.send_individual_messages(messages)
 
     async def send_individual_messages(self, messages: list):
         """单独发送 (每条消息渲染一张图片)"""
-        group_id = str(self.group_id).replace(":", "_")
-        origin = f"{self.get_effective_platform_name()}:GroupMessage:{group_id}"
+        origin = self._get_group_origin()
+
+        async def _render(msg: dict) -> bytes | None:
+            async with self._send_semaphore:
+                return await self._render_message(msg)
 
-        for msg in messages:
+        # 有限并发渲染，渲染完成后按入队顺序逐条发送
+        images = await asyncio.gather(
+            *(_render(msg) for msg in messages), return_exceptions=True
+        )
+        for msg, img in zip(messages, images):
             trace_id = msg.get("trace_id", "Unknown")
+            if isinstance(img, Exception):
+                logger.error("[%s] 消息渲染失败: %s", trace_id, img)
+                continue
+            if not img:
+                continue
             try:
-                logger.info(f"[{trace_id}] 正在渲染")
-                # 使用 HtmlRenderer 异步渲染
-                img = await self.image_renderer.render(
-                    msg["message_text"],
-                    msg.get("poster_url") or msg.get("image_url"),
-                    template_name=msg.get("template", "card_default.html"),
-                )
-                if img:
-                    chain = MessageChain([Comp.Image.fromBytes(img)])
-                    await self.context.send_message(origin, chain)
-                    logger.info(f"[{trace_id}] 发送成功")
-                    await asyncio.sleep(0.5)
+                chain = MessageChain([Comp.Image.fromBytes(img)])
+                await self._acquire_send_slot()
+                await self.context.send_message(origin, chain)
+                logger.info("[%s] 发送成功", trace_id)
             except Exception as e:
-                logger.error(f"单条消息发送失败: {e}")
+                logger.error("[%s] 单条消息发送失败: %s", trace_id, e)
+
+    def _get_group_origin(self) -> str:
+        """获取目标群的会话标识，平台名不变时复用"""
+        platform = self.get_effective_platform_name()
+        if self._group_origin is None or self._group_origin[0] != platform:
+            origin = f"{platform}:GroupMessage:{self.target_group_id}"
+            self._group_origin = (platform, origin)
+        return self._group_origin[1]
+
+    async def _render_message(self, msg: dict) -> bytes | None:
+        """渲染消息图片，结果缓存在消息上，批量发送失败回退时无需重复渲染"""
+        img = msg.get("_rendered_image")
+        if img:
+            return img
+        logger.info("[%s] 正在渲染", msg.get("trace_id", "Unknown"))
+        # 使用 HtmlRenderer 异步渲染
+        img = await self.image_renderer.render(
+            msg["message_text"],
+            msg.get("poster_url") or msg.get("image_url"),
+            template_name=msg.get("template", "card_default.html"),
+        )
+        if img:
+            msg["_rendered_image"] = img
+        return img
+
+    async def _acquire_send_slot(self):
+        """滑动窗口限流，仅在 1 秒内发送数超过上限时等待"""
+        while True:
+            now = time.monotonic()
+            while self._send_timestamps and now - self._send_timestamps[0] >= 1.0:
+                self._send_timestamps.popleft()
+            if len(self._send_timestamps) < self.send_rate_limit:
+                self._send_timestamps.append(now)
+                return
+            await asyncio.sleep(1.0 - (now - self._send_timestamps[0]))
 
     @filter.command("webhook status")
     async def webhook_status(self, event: AstrMessageEvent):
         """查看 Webhook 状态 (AstrBot 命令)"""
-        status_text = f"📊 Webhook 状态\n\n🌐 端口: {self.webhook_port}\n📋 待发: {len(self.message_queue)}\n🎯 目标: {self.group_id}"
+        status_text = "\n".join(
+            (
+                "📊 Webhook 状态",
+                "",
+                f"🌐 端口: {self.webhook_port}",
+                f"📋 待发: {len(self.message_queue)}",
+                f"🎯 目标: {self.group_id}",
+            )
+        )
         yield event.plain_result(status_text)
 
     @filter.command("webhook clear_cache")
@@ -498,7 +675,7 @@ class Main(Star):
             else:
                 yield event.plain_result("❌ 媒体处理器未初始化")
         except Exception as e:
-            logger.error(f"清除缓存失败: {e}")
+            logger.error("清除缓存失败: %s", e)
             yield event.plain_result(f"❌ 清除缓存失败: {e}")
 
     async def terminate(self):
@@ -509,16 +686,21 @@ class Main(Star):
             await self.site.stop()
         if self.runner:
             await self.runner.cleanup()
+        await self.media_handler.close()
         await BrowserManager.close()
 
     def get_effective_platform_name(self) -> str:
         if self.platform_name == "auto":
+            if self._detected_platform:
+                return self._detected_platform
             # 简化版自动检测逻辑
             available = [
                 p.meta().id for p in self.context.platform_manager.platform_insts
             ]
-            for p in ["llonebot", "napcat", "aiocqhttp"]:
+            for p in AUTO_DETECT_PLATFORMS:
                 if any(p in name.lower() for name in available):
+                    self._detected_platform = p
                     return p
+            # 未匹配到已知协议时不缓存，平台可能稍后才加载
             return available[0] if available else "llonebot"
         return self.platform_name
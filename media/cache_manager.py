@@ -5,6 +5,8 @@ import time
 
 from astrbot.api import logger
 
+from ..utils import json_utils
+
 
 class CacheManager:
     """基于 SQLite 的持久化缓存管理器"""
@@ -41,9 +43,9 @@ class CacheManager:
                 )
                 row = cursor.fetchone()
                 if row:
-                    return json.loads(row[0])
+                    return json_utils.loads(row[0])
         except Exception as e:
-            logger.error(f"持久化缓存读取失败: {e}")
+            logger.error("持久化缓存读取失败: %s", e)
         return None
 
     def set(self, key: str, data: dict):
@@ -58,7 +60,7 @@ class CacheManager:
                 )
                 conn.commit()
         except Exception as e:
-            logger.error(f"持久化缓存写入失败: {e}")
+            logger.error("持久化缓存写入失败: %s", e)
 
     def cleanup(self):
         """清理过期缓存"""
@@ -68,10 +70,10 @@ class CacheManager:
                     "DELETE FROM media_cache WHERE expiry < ?", (int(time.time()),)
                 )
                 if cursor.rowcount > 0:
-                    logger.info(f"已清理 {cursor.rowcount} 条过期的持久化缓存数据")
+                    logger.info("已清理 %s 条过期的持久化缓存数据", cursor.rowcount)
                 conn.commit()
         except Exception as e:
-            logger.error(f"清理过期缓存失败: {e}")
+            logger.error("清理过期缓存失败: %s", e)
 
     def clear_all(self) -> int:
         """清除所有缓存"""
@@ -80,8 +82,8 @@ class CacheManager:
                 cursor = conn.execute("DELETE FROM media_cache")
                 count = cursor.rowcount
                 conn.commit()
-                logger.info(f"已手动清除 {count} 条所有媒体缓存数据")
+                logger.info("已手动清除 %s 条所有媒体缓存数据", count)
                 return count
         except Exception as e:
-            logger.error(f"手动清除缓存失败: {e}")
+            logger.error("手动清除缓存失败: %s", e)
             return 0
@@ -3,30 +3,64 @@
 负责媒体数据的检测、处理、去重等功能
 """
 
+import asyncio
 import hashlib
 import json
+import re
 import time
+from collections import OrderedDict
 
 from astrbot.api import logger
 
+from ..utils import json_utils
 from .media_handler import MediaHandler
 
+# Plex multipart 载荷中 payload 字段的 JSON 内容
+_PLEX_PAYLOAD_RE = re.compile(r'name="payload"\r\n\r\n(\{.*?\})\r\n', re.DOTALL)
+# 不参与去重哈希的不稳定字段
+_UNSTABLE_FIELDS = frozenset({"image_url", "timestamp", "runtime_ticks"})
+# 超过该大小的请求体在线程中计算哈希，避免阻塞事件循环
+_OFFLOAD_HASH_SIZE = 64 * 1024
+
+
+def _hash_bytes(data: bytes) -> str:
+    """去重键不涉及安全边界，使用比 SHA-256 更快的 128 位 BLAKE2b"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 
 class MediaDataProcessor:
     """媒体数据处理器"""
 
-    def __init__(self, media_handler: MediaHandler, cache_ttl_seconds: int = 300):
+    def __init__(
+        self,
+        media_handler: MediaHandler,
+        cache_ttl_seconds: int = 300,
+        cache_max_entries: int = 10000,
+        dedup_enabled: bool = True,
+    ):
         self.media_handler = media_handler
         self.cache_ttl_seconds = cache_ttl_seconds
-        self.request_cache: dict[str, float] = {}
-
-    def is_duplicate_request(self, media_data: dict) -> bool:
+        self.cache_max_entries = cache_max_entries
+        # 关闭去重或缓存时长为 0 时，完全跳过哈希计算
+        self.dedup_enabled = dedup_enabled and cache_ttl_seconds > 0
+        # 所有条目 TTL 相同，插入顺序即过期顺序，只需从头部弹出过期项
+        self.request_cache: OrderedDict[str, float] = OrderedDict()
+
+    def is_duplicate_raw(self, body_hash: str) -> bool:
+        """按原始请求体哈希快速判重，命中时可跳过解析与数据丰富"""
+        self.cleanup_expired_cache(time.monotonic())
+        return body_hash in self.request_cache
+
+    def is_duplicate_request(self, media_data: dict, body_hash: str = "") -> bool:
         """检查是否为重复请求 - 使用哈希校验，排除图片以保持更高准确率"""
-        request_hash = self.calculate_request_hash(media_data)
+        return self.is_duplicate_hash(self.calculate_request_hash(media_data), body_hash)
+
+    def is_duplicate_hash(self, request_hash: str, body_hash: str = "") -> bool:
+        """按已计算的请求哈希判重，未重复时记录该哈希及原始请求体哈希"""
         if not request_hash:
             return False
 
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # 清理过期缓存
         self.cleanup_expired_cache(current_time)
@@ -35,48 +69,63 @@ class MediaDataProcessor:
         if request_hash in self.request_cache:
             cached_time = self.request_cache[request_hash]
             logger.debug(
-                f"检测到重复请求，哈希: {request_hash[:8]}..., 缓存时间: {cached_time}"
+                "检测到重复请求，哈希: %s..., 缓存时间: %s", request_hash[:8], cached_time
             )
             return True
 
-        # 缓存新请求
-        self.request_cache[request_hash] = current_time + self.cache_ttl_seconds
-        logger.debug(
-            f"缓存新请求，哈希: {request_hash[:8]}..., 过期时间: {current_time + self.cache_ttl_seconds}"
-        )
+        # 缓存新请求，原始请求体哈希一并记录，完全相同的重发可提前拦截
+        expire_time = current_time + self.cache_ttl_seconds
+        self._remember_hash(request_hash, expire_time)
+        if body_hash:
+            self._remember_hash(body_hash, expire_time)
+        logger.debug("缓存新请求，哈希: %s..., 过期时间: %s", request_hash[:8], expire_time)
         return False
 
+    def _remember_hash(self, request_hash: str, expire_time: float):
+        """写入去重缓存，超出容量时淘汰最早的条目"""
+        self.request_cache[request_hash] = expire_time
+        if len(self.request_cache) > self.cache_max_entries:
+            self.request_cache.popitem(last=False)
+
     def calculate_request_hash(self, media_data: dict) -> str:
         """计算请求哈希值 - 排除图片和不稳定字段以提高准确率"""
         try:
             return self.calculate_standard_hash(media_data)
         except Exception as e:
-            logger.error(f"计算请求哈希失败: {e}")
+            logger.error("计算请求哈希失败: %s", e)
             return ""
 
     def calculate_standard_hash(self, media_data: dict) -> str:
         """计算标准媒体数据的哈希值"""
-        # 排除不稳定字段
-        stable_fields = {
-            k: v
-            for k, v in media_data.items()
-            if k not in ["image_url", "timestamp", "runtime_ticks"]
-        }
-        hash_string = json.dumps(stable_fields, sort_keys=True)
-        return hashlib.sha256(hash_string.encode()).hexdigest()
+        # 排除不稳定字段，按键排序逐项写入哈希，字符串直接编码，
+        # 嵌套结构才序列化为 JSON，避免构造整份 JSON 文本
+        h = hashlib.blake2b(digest_size=16)
+        for key in sorted(media_data):
+            if key in _UNSTABLE_FIELDS:
+                continue
+            value = media_data[key]
+            h.update(key.encode())
+            h.update(b"\x1f")
+            if isinstance(value, str):
+                h.update(value.encode())
+            else:
+                h.update(json_utils.dumps_sorted(value))
+            h.update(b"\x1e")
+        return h.hexdigest()
 
     def cleanup_expired_cache(self, current_time: float):
         """清理过期缓存"""
-        expired_keys = [
-            key
-            for key, expire_time in self.request_cache.items()
-            if current_time > expire_time
-        ]
-        for key in expired_keys:
-            del self.request_cache[key]
-
-        if expired_keys:
-            logger.debug(f"清理了 {len(expired_keys)} 个过期缓存条目")
+        cache = self.request_cache
+        removed = 0
+        while cache:
+            key, expire_time = next(iter(cache.items()))
+            if current_time <= expire_time:
+                break
+            del cache[key]
+            removed += 1
+
+        if removed:
+            logger.debug("清理了 %s 个过期缓存条目", removed)
 
     async def detect_and_process_raw_data(self, raw_msg: dict) -> dict | None:
         """检测和处理原始数据"""
@@ -84,6 +133,20 @@ class MediaDataProcessor:
             body_text = raw_msg.get("raw_data", "")
             headers = raw_msg.get("headers", {})
 
+            body_hash = ""
+            offload = False
+            if self.dedup_enabled:
+                # 原始请求体完全相同的重发，在解析与数据丰富之前直接丢弃
+                body_bytes = body_text.encode()
+                offload = len(body_bytes) > _OFFLOAD_HASH_SIZE
+                if offload:
+                    body_hash = await asyncio.to_thread(_hash_bytes, body_bytes)
+                else:
+                    body_hash = _hash_bytes(body_bytes)
+                if self.is_duplicate_raw(body_hash):
+                    logger.info("检测到重复请求体，忽略")
+                    return None
+
             # 处理 Plex 的 multipart/form-data 特殊情况
             if (
                 "multipart/form-data" in headers.get("Content-Type", "").lower()
@@ -94,23 +157,20 @@ class MediaDataProcessor:
                 if 'name="payload"' in body_text:
                     try:
                         # 尝试正则匹配提取 payload 部分
-                        import re
-
-                        match = re.search(
-                            r'name="payload"\r\n\r\n(\{.*?\})\r\n', body_text, re.DOTALL
-                        )
+                        match = _PLEX_PAYLOAD_RE.search(body_text)
                         if match:
                             body_text = match.group(1)
                             logger.info("成功从 Plex Multipart 载荷中提取 JSON")
                     except Exception as e:
-                        logger.warning(f"从 Plex Multipart 提取数据失败: {e}")
+                        logger.warning("从 Plex Multipart 提取数据失败: %s", e)
 
             # 处理标准媒体数据
             try:
-                raw_data = json.loads(body_text)
-                logger.debug(f"成功解析 Webhook JSON 数据: {str(raw_data)[:200]}...")
+                raw_data = json_utils.loads(body_text)
+                # %.200s 仅在日志实际输出时才将整个载荷转为字符串再截断
+                logger.debug("成功解析 Webhook JSON 数据: %.200s...", raw_data)
             except json.JSONDecodeError as e:
-                logger.error(f"JSON 解析失败: {e}, 原始数据预览: {body_text[:200]}")
+                logger.error("JSON 解析失败: %s, 原始数据预览: %.200s", e, body_text)
                 return None
 
             # 检测媒体来源
@@ -119,7 +179,7 @@ class MediaDataProcessor:
                 logger.warning("未识别的媒体数据格式")
                 return None
 
-            logger.info(f"检测到媒体来源: {detected_source}")
+            logger.info("检测到媒体来源: %s", detected_source)
 
             # 使用媒体处理器处理数据
             media_data = await self.media_handler.process_media_data(
@@ -133,15 +193,22 @@ class MediaDataProcessor:
                 logger.error("媒体数据验证失败")
                 return None
 
-            # 检查重复请求
-            if self.is_duplicate_request(media_data):
-                logger.info("检测到重复请求，忽略")
-                return None
+            # 检查重复请求，大载荷的哈希计算同样放到线程中
+            if self.dedup_enabled:
+                if offload:
+                    request_hash = await asyncio.to_thread(
+                        self.calculate_request_hash, media_data
+                    )
+                else:
+                    request_hash = self.calculate_request_hash(media_data)
+                if self.is_duplicate_hash(request_hash, body_hash):
+                    logger.info("检测到重复请求，忽略")
+                    return None
 
             # 标记为媒体消息
             media_data["message_type"] = "media"
             return media_data
 
         except Exception as e:
-            logger.error(f"原始数据检测和处理失败: {e}")
+            logger.error("原始数据检测和处理失败: %s", e)
             return None
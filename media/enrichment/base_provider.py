@@ -4,14 +4,32 @@
 """
 
 import asyncio
+import json
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import aiohttp
 
 from astrbot.api import logger
 
+from ...utils import json_utils
+
+# 响应缓存的条目上限，超出时淘汰最早写入的条目
+_CACHE_MAX_ENTRIES = 500
+# 未命中缓存的条目上限，超出时淘汰最早记录的条目
+_MISS_CACHE_MAX_ENTRIES = 1000
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """创建带连接池与 DNS 缓存的 HTTP 会话，错误状态码抛出 ClientResponseError"""
+    connector = aiohttp.TCPConnector(
+        limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75
+    )
+    return aiohttp.ClientSession(connector=connector, raise_for_status=True)
+
 
 class MediaEnrichmentProvider(ABC):
     """媒体数据丰富提供者基础接口"""
@@ -87,12 +105,49 @@ class MediaImageProvider(ABC):
 class BaseProvider:
     """提供通用的 HTTP 请求及缓存逻辑"""
 
-    def __init__(self, cache_ttl: int = 3600, request_interval: float = 0.5):
-        self.cache: dict[str, Any] = {}
-        self.cache_timestamps: dict[str, float] = {}
+    def __init__(
+        self,
+        cache_ttl: int = 3600,
+        request_interval: float = 0.5,
+        miss_cache_ttl: int = 3600,
+    ):
+        # 响应缓存: 键 -> (过期时间, 数据)，缓存的数据由调用方只读使用
+        self.cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
         self.cache_ttl = cache_ttl
+        # 未命中缓存：记录已知查不到的条目，到期后再重新查询
+        # 所有条目 TTL 相同，插入顺序即过期顺序
+        self.miss_cache: OrderedDict[str, float] = OrderedDict()
+        self.miss_cache_ttl = miss_cache_ttl
         self.last_request_time = 0
         self.request_interval = request_interval
+        # 由管理器注入的共享会话获取函数，所有提供者共用同一个连接池
+        self.session_getter: Callable[[], Awaitable[aiohttp.ClientSession]] | None = None
+        # 单独使用时的自有会话，首次请求时创建
+        self._session: aiohttp.ClientSession | None = None
+        self.request_headers: dict[str, str] = {}
+        self.request_timeout = aiohttp.ClientTimeout(total=10)
+        # 进行中的请求，相同键的并发查询共享同一次 HTTP 调用
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取 HTTP 会话，优先使用管理器注入的共享会话"""
+        if self.session_getter is not None:
+            return await self.session_getter()
+        if self._session is None or self._session.closed:
+            self._session = create_http_session()
+        return self._session
+
+    async def close(self):
+        """关闭自有的 HTTP 会话 (共享会话由管理器负责关闭)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _merge_headers(self, headers: dict | None) -> dict[str, str]:
+        """合并提供者默认请求头与单次请求头"""
+        if not headers:
+            return self.request_headers
+        return {**self.request_headers, **headers}
 
     async def _http_get(
         self, url: str, params: dict | None = None, headers: dict | None = None
@@ -100,37 +155,90 @@ class BaseProvider:
         """封装 aiohttp GET 请求，带频率限制"""
         await self._rate_limit()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, params=params, headers=headers, timeout=10
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        return None
-                    else:
-                        logger.warning(f"HTTP GET {url} 失败: {response.status}")
-                        return None
+            session = await self._get_session()
+            async with session.get(
+                url,
+                params=params,
+                headers=self._merge_headers(headers),
+                timeout=self.request_timeout,
+            ) as response:
+                return await response.json(loads=json_utils.loads)
+        except aiohttp.ContentTypeError as e:
+            # 状态码正常但响应不是 JSON，不能按 HTTP 错误记录
+            logger.warning("HTTP GET %s 返回非 JSON 响应: %s", url, e.message)
+            return None
+        except json.JSONDecodeError as e:
+            logger.warning("HTTP GET %s 响应 JSON 解析失败: %s", url, e)
+            return None
+        except aiohttp.ClientResponseError as e:
+            if e.status != 404:
+                logger.warning("HTTP GET %s 失败: %s", url, e.status)
+            return None
         except Exception as e:
-            logger.error(f"HTTP 请求异常 ({url}): {e}")
+            logger.error("HTTP 请求异常 (%s): %s", url, e)
             return None
 
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """合并相同键的并发请求，只有首个调用者真正发起请求"""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # 避免无人等待时出现 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
     def _get_from_cache(self, key: str) -> Any | None:
-        if key in self.cache_timestamps:
-            if time.time() - self.cache_timestamps[key] < self.cache_ttl:
-                return self.cache.get(key)
-            else:
-                self.cache.pop(key, None)
-                self.cache_timestamps.pop(key, None)
+        """读取未过期的缓存数据，返回的对象与缓存共享，调用方不得修改"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() < entry[0]:
+            return entry[1]
+        del self.cache[key]
         return None
 
-    def _set_cache(self, key: str, value: Any):
-        self.cache[key] = value
-        self.cache_timestamps[key] = time.time()
+    def _set_cache(self, key: str, value: Any, ttl: float | None = None):
+        """写入缓存，可单独指定 TTL，超出容量时淘汰最早写入的条目"""
+        expire_time = time.monotonic() + (self.cache_ttl if ttl is None else ttl)
+        self.cache[key] = (expire_time, value)
+        self.cache.move_to_end(key)
+        if len(self.cache) > _CACHE_MAX_ENTRIES:
+            self.cache.popitem(last=False)
+        self.miss_cache.pop(key, None)
+
+    def _is_known_miss(self, key: str) -> bool:
+        """检查该条目是否在近期已确认查询不到"""
+        misses = self.miss_cache
+        now = time.monotonic()
+        # 只需从头部弹出过期项
+        while misses and next(iter(misses.values())) <= now:
+            misses.popitem(last=False)
+        return key in misses
+
+    def _set_miss(self, key: str):
+        """记录查询未命中，避免短时间内重复请求，超出容量时淘汰最早的条目"""
+        self.miss_cache[key] = time.monotonic() + self.miss_cache_ttl
+        self.miss_cache.move_to_end(key)
+        if len(self.miss_cache) > _MISS_CACHE_MAX_ENTRIES:
+            self.miss_cache.popitem(last=False)
 
     async def _rate_limit(self):
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.request_interval:
-            await asyncio.sleep(self.request_interval - elapsed)
-        self.last_request_time = time.time()
+        # 先预留请求时间槽再等待，保证并发请求之间同样保持间隔
+        current_time = time.monotonic()
+        scheduled = max(current_time, self.last_request_time + self.request_interval)
+        self.last_request_time = scheduled
+        if scheduled > current_time:
+            await asyncio.sleep(scheduled - current_time)
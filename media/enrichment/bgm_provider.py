@@ -7,12 +7,20 @@ from typing import Any
 
 from .base_provider import BaseProvider, MediaEnrichmentProvider, MediaImageProvider
 
+# 搜索仅限动画条目，音乐/图书类通知无需请求 BGM.tv
+_UNSUPPORTED_TYPES = frozenset(
+    {"Audio", "Song", "Album", "MusicVideo", "Book", "AudioBook"}
+)
+# 封面图尺寸优先级
+_IMAGE_PRIORITY = ("large", "common", "medium")
+
 
 class BGMProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
     """BGM.tv 数据和图片提供者"""
 
     def __init__(self, config: dict[str, Any]):
-        BaseProvider.__init__(self, request_interval=0.5)
+        # BGM.tv 多作为 TMDB 未命中时的兜底，未命中结果保留更久
+        BaseProvider.__init__(self, request_interval=0.5, miss_cache_ttl=6 * 3600)
         self.config = config
         self.base_url = "https://api.bgm.tv"
 
@@ -29,6 +37,8 @@ class BGMProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
         # 如果已经通过 TMDB 丰富过了，且不是剧集，跳过 (或者根据需要保留)
         if media_data.get("tmdb_enriched") and media_data.get("item_type") == "Movie":
             return media_data
+        if media_data.get("item_type") in _UNSUPPORTED_TYPES:
+            return media_data
 
         name = media_data.get("series_name") or media_data.get("item_name")
         if not name:
@@ -46,8 +56,7 @@ class BGMProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             )
             # 如果没有图片，尝试获取 BGM 的图片
             if not media_data.get("image_url"):
-                images = subject.get("images", {})
-                media_data["image_url"] = images.get("large") or images.get("common")
+                media_data["image_url"] = self._pick_image(subject)
 
         return media_data
 
@@ -55,7 +64,8 @@ class BGMProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
         return await self.get_image(media_data)
 
     async def get_image(self, media_data: dict) -> str:
-
+        if media_data.get("item_type") in _UNSUPPORTED_TYPES:
+            return ""
 
         name = media_data.get("series_name") or media_data.get("item_name")
         if not name:
@@ -63,17 +73,30 @@ class BGMProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
 
         subject = await self._search_subject(name)
         if subject:
-            images = subject.get("images", {})
-            return images.get("large") or images.get("common") or ""
+            return self._pick_image(subject)
 
         return ""
 
+    @staticmethod
+    def _pick_image(subject: dict) -> str:
+        """按尺寸优先级选取第一张可用封面"""
+        images = subject.get("images") or {}
+        return next((images[k] for k in _IMAGE_PRIORITY if images.get(k)), "")
+
     async def _search_subject(self, name: str) -> dict | None:
         cache_key = f"bgm_search_{name}"
         cached = self._get_from_cache(cache_key)
         if cached:
             return cached
+        if self._is_known_miss(cache_key):
+            return None
+
+        # 同名并发查询共享同一次 HTTP 调用
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_subject(name, cache_key)
+        )
 
+    async def _fetch_subject(self, name: str, cache_key: str) -> dict | None:
         # BGM V0 Search API (推荐使用)
         url = f"{self.base_url}/search/subject/{name}"
         # 限制类型为 2 (动漫)
@@ -82,4 +105,7 @@ class BGMProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             subject = data["list"][0]
             self._set_cache(cache_key, subject)
             return subject
+        if data is not None:
+            # 仅在接口正常返回但无结果时记录未命中，网络异常不缓存
+            self._set_miss(cache_key)
         return None
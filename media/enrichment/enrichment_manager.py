@@ -5,9 +5,13 @@
 
 import os
 import hashlib
+
+import aiohttp
+
 from astrbot.api import logger
 
 from ..cache_manager import CacheManager
+from .base_provider import create_http_session
 from .tmdb_provider import TMDBProvider
 from .tvdb_provider import TVDBProvider
 from .bgm_provider import BGMProvider
@@ -29,10 +33,14 @@ class EnrichmentManager:
         self.cache = CacheManager(db_dir, persistence_days)
         self.cache.cleanup()
 
-        # 2. 初始化翻译器
+        # 2. 所有提供者共享的 HTTP 会话，首次请求时在事件循环内创建
+        self._session: aiohttp.ClientSession | None = None
+
+        # 3. 初始化翻译器
         self.translator = Translator(self.config)
+        self.translator.session_getter = self.get_session
 
-        # 3. 初始化提供者
+        # 4. 初始化提供者
         self._initialize_providers()
 
     def _initialize_providers(self):
@@ -62,7 +70,9 @@ class EnrichmentManager:
         order = {"TMDB": 0, "Bangumi": 1, "TVDB": 2}
         self.enrichment_providers.sort(key=lambda x: order.get(x.name, 99))
         self.image_providers.sort(key=lambda x: order.get(x.name, 99))
-        logger.info(f"媒体提供者加载完成: {', '.join(enabled)}")
+        for provider in self.enrichment_providers:
+            provider.session_getter = self.get_session
+        logger.info("媒体提供者加载完成: %s", ', '.join(enabled))
 
     async def enrich_media_data(self, media_data: dict) -> dict:
         """核心数据丰富流程，包含自动翻译"""
@@ -74,16 +84,20 @@ class EnrichmentManager:
                 media_data.update(cached)
                 return media_data
 
-            # 2. 依次尝试提供者
+            # 2. 依次尝试提供者，没有名称和外部 ID 时无从查询，直接跳过
             enriched = False
-            for provider in self.enrichment_providers:
+            providers = (
+                self.enrichment_providers if self._has_lookup_key(media_data) else ()
+            )
+            for provider in providers:
                 try:
                     res = await provider.enrich_media_data(media_data.copy())
                     if res != media_data:
                         media_data.update(res)
                         enriched = True
-                        break 
-                except: continue
+                        break
+                except Exception:
+                    continue
 
             # 3. 自动翻译英文简介
             overview = media_data.get("overview")
@@ -100,18 +114,48 @@ class EnrichmentManager:
 
             return media_data
         except Exception as e:
-            logger.error(f"数据丰富出错: {e}")
+            logger.error("数据丰富出错: %s", e)
             return media_data
 
     async def get_media_image(self, media_data: dict) -> str:
         """获取媒体图片地址"""
+        if not self._has_lookup_key(media_data):
+            return ""
         for provider in self.image_providers:
             try:
                 url = await provider.get_image(media_data)
                 if url: return url
-            except: continue
+            except Exception:
+                continue
         return ""
 
+    async def get_session(self) -> aiohttp.ClientSession:
+        """获取（必要时创建）提供者共享的 HTTP 会话"""
+        if self._session is None or self._session.closed:
+            self._session = create_http_session()
+        return self._session
+
+    async def close(self):
+        """关闭共享 HTTP 会话及各提供者自有的会话"""
+        for provider in self.enrichment_providers:
+            try:
+                await provider.close()
+            except Exception as e:
+                logger.debug("关闭提供者 %s 会话失败: %s", provider.name, e)
+        await self.translator.close()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _has_lookup_key(media_data: dict) -> bool:
+        """是否具备外部查询所需的名称或外部 ID"""
+        return bool(
+            media_data.get("series_name")
+            or media_data.get("item_name")
+            or media_data.get("provider_ids")
+        )
+
     def _generate_cache_key(self, media_data: dict) -> str:
         """生成缓存 Key"""
         p_ids = media_data.get("provider_ids", {})
@@ -3,20 +3,37 @@ TMDB 媒体数据提供者
 提供 TMDB API 的媒体数据丰富和图片获取功能
 """
 
+import asyncio
+import json
 import re
-import aiohttp
 from typing import Any
 
+import aiohttp
+
 from astrbot.api import logger
 
+from ...utils import json_utils
 from .base_provider import BaseProvider, MediaEnrichmentProvider, MediaImageProvider
 
+_TRAILING_YEAR_RE = re.compile(r"\d{4}$")
+_PAREN_RE = re.compile(r"\(.*?\)")
+_PUNCT_RE = re.compile(r"[^\w\s\u4e00-\u9fa5]")
+# 不参与缓存键的凭据参数
+_CREDENTIAL_PARAMS = frozenset({"api_key"})
+# 简介为空的详情 (如刚上线的新集) 只短暂缓存，以便尽快取到补全后的简介
+_EMPTY_DETAIL_TTL = 10 * 60
+
 
 class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
     """TMDB 媒体数据和图片提供者"""
 
-    def __init__(self, api_key: str, fanart_api_key: str = ""):
-        BaseProvider.__init__(self, request_interval=0.2)
+    def __init__(
+        self, api_key: str, fanart_api_key: str = "", cache_ttl: int = 6 * 3600
+    ):
+        # 同一剧集的新集通知会反复查询相同条目，响应缓存较长时间
+        BaseProvider.__init__(self, cache_ttl=cache_ttl, request_interval=0.2)
+        self.request_headers = {"User-Agent": "AstrBot/1.0 (MediaWebhookPlugin)"}
+        self.request_timeout = aiohttp.ClientTimeout(total=12)
         self.tmdb_api_key = api_key
         self.fanart_api_key = fanart_api_key
         self.tmdb_base_url = "https://api.themoviedb.org/3"
@@ -40,7 +57,7 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             item_type = str(raw_type).title() if raw_type else ""
 
             if item_type not in ["Movie", "Episode", "Series", "Season"]:
-                logger.debug(f"TMDB 跳过不支持的类型: {item_type}")
+                logger.debug("TMDB 跳过不支持的类型: %s", item_type)
                 return media_data
 
             p_ids = media_data.get("provider_ids", {})
@@ -57,7 +74,7 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
                 if media_data.get("tmdb_enriched") or media_data.get("poster_path"):
                     return media_data
                 else:
-                    logger.warning(f"TMDB ID {tmdb_id} 匹配失败，将尝试通过搜索获取...")
+                    logger.warning("TMDB ID %s 匹配失败，将尝试通过搜索获取...", tmdb_id)
 
             # 2. 如果只有 IMDB ID
             if imdb_id and not media_data.get("tmdb_enriched"):
@@ -78,7 +95,7 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
                 return await self._enrich_tv_by_search(media_data)
 
         except Exception as e:
-            logger.error(f"TMDB 数据丰富出错: {e}")
+            logger.error("TMDB 数据丰富出错: %s", e)
             return media_data
 
     async def get_media_image(self, media_data: dict) -> str:
@@ -91,25 +108,38 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             season_number = media_data.get("season_number")
             episode_number = media_data.get("episode_number")
 
-            if item_type == "Episode" and season_number and episode_number:
-                tmdb_id = media_data.get("tmdb_tv_id") or media_data.get("tmdb_id")
-                if tmdb_id:
-                    details = await self._get_tmdb_episode_details(
-                        tmdb_id, season_number, episode_number
-                    )
-                    if details and details.get("still_path"):
-                        return f"https://image.tmdb.org/t/p/w500{details['still_path']}"
-
+            # 剧集截图与 Fanart 互不依赖，并发请求后按优先级取用
+            lookups = {}
+            tmdb_id = media_data.get("tmdb_tv_id") or media_data.get("tmdb_id")
+            if item_type == "Episode" and season_number and episode_number and tmdb_id:
+                lookups["still"] = self._get_tmdb_episode_details(
+                    tmdb_id, season_number, episode_number
+                )
             if self.fanart_api_key and item_type != "Movie":
-                fanart_image = await self._get_fanart_image(media_data)
-                if fanart_image:
-                    return fanart_image
+                lookups["fanart"] = self._get_fanart_image(media_data)
+            results = dict(
+                zip(
+                    lookups,
+                    await asyncio.gather(*lookups.values(), return_exceptions=True),
+                )
+            )
+            # 单个来源失败不影响其余来源与海报回退
+            for source, result in results.items():
+                if isinstance(result, Exception):
+                    logger.warning("获取 %s 图片失败: %s", source, result)
+                    results[source] = None
+
+            details = results.get("still")
+            if details and details.get("still_path"):
+                return f"https://image.tmdb.org/t/p/w500{details['still_path']}"
+            fanart_image = results.get("fanart")
+            if fanart_image:
+                return fanart_image
 
             poster_path = media_data.get("poster_path")
             if poster_path:
                 return f"https://image.tmdb.org/t/p/w500{poster_path}"
 
-            tmdb_id = media_data.get("tmdb_tv_id") or media_data.get("tmdb_id")
             if tmdb_id and not poster_path:
                 try:
                     endpoint = "tv" if media_data.get("tmdb_tv_id") or item_type in ["Series", "Season", "Episode"] else "movie"
@@ -121,7 +151,7 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
                     if media_data.get("poster_path"):
                         return f"https://image.tmdb.org/t/p/w500{media_data['poster_path']}"
                 except Exception as e:
-                    logger.warning(f"补全 TMDB 海报详情失败: {e}")
+                    logger.warning("补全 TMDB 海报详情失败: %s", e)
 
             if not tmdb_id and not media_data.get("poster_path"):
                 try:
@@ -130,43 +160,69 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
                         search_name = media_data.get('item_name') or media_data.get('series_name')
                     
                     if search_name:
-                        self.cache.clear() 
-                        logger.warning(f"TMDB ID 缺失，尝试即时搜索: {search_name}")
+                        logger.warning("TMDB ID 缺失，尝试即时搜索: %s", search_name)
                         await self.enrich_media_data(media_data)
                         if media_data.get("poster_path"):
                             return f"https://image.tmdb.org/t/p/w500{media_data['poster_path']}"
                 except Exception as e:
-                    logger.warning(f"即时搜索 TMDB 异常: {e}")
+                    logger.warning("即时搜索 TMDB 异常: %s", e)
 
             return ""
         except Exception as e:
-            logger.error(f"TMDB 图片获取出错: {e}")
+            logger.error("TMDB 图片获取出错: %s", e)
             return ""
 
     async def _http_get(
         self, url: str, params: dict | None = None, headers: dict | None = None
     ) -> dict | None:
-        """封装 aiohttp GET 请求"""
+        """带响应缓存的 GET 请求，相同请求并发时只发起一次
+
+        返回的数据与缓存及其他并发调用方共享，只能读取，不可修改
+        """
+        key_params = sorted(
+            (k, v) for k, v in (params or {}).items() if k not in _CREDENTIAL_PARAMS
+        )
+        cache_key = f"{url}?{key_params}" if key_params else url
+        cached = self._get_from_cache(cache_key)
+        if cached is not None:
+            return cached
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_json(cache_key, url, params, headers)
+        )
+
+    async def _fetch_json(
+        self, cache_key: str, url: str, params: dict | None, headers: dict | None
+    ) -> dict | None:
+        """封装 aiohttp GET 请求，成功的响应写入缓存"""
         await self._rate_limit()
-        if not headers:
-            headers = {}
-        headers["User-Agent"] = "AstrBot/1.0 (MediaWebhookPlugin)"
-        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, params=params, headers=headers, timeout=12
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 401:
-                        logger.error("TMDB API Key 无效 (401)")
-                        return None
-                    else:
-                        return None
+            session = await self._get_session()
+            async with session.get(
+                url,
+                params=params,
+                headers=self._merge_headers(headers),
+                timeout=self.request_timeout,
+            ) as response:
+                data = await response.json(loads=json_utils.loads)
+        except aiohttp.ContentTypeError as e:
+            logger.warning("TMDB 返回非 JSON 响应 (%s): %s", url, e.message)
+            return None
+        except json.JSONDecodeError as e:
+            logger.warning("TMDB 响应 JSON 解析失败 (%s): %s", url, e)
+            return None
+        except aiohttp.ClientResponseError as e:
+            if e.status == 401:
+                logger.error("TMDB API Key 无效 (401)")
+            return None
         except Exception as e:
-            logger.error(f"TMDB HTTP 请求异常 ({url}): {e}")
+            logger.error("TMDB HTTP 请求异常 (%s): %s", url, e)
             return None
+        if data is not None:
+            ttl = None
+            if isinstance(data, dict) and "overview" in data and not data["overview"]:
+                ttl = _EMPTY_DETAIL_TTL
+            self._set_cache(cache_key, data, ttl)
+        return data
 
     # --- 私有方法：详情获取 ---
 
@@ -189,10 +245,20 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
 
     async def _enrich_tv_by_id(self, media_data: dict, tv_id: str) -> dict:
         url = f"{self.tmdb_base_url}/tv/{tv_id}"
-        data = await self._http_get(
-            url, params={"api_key": self.tmdb_api_key, "language": "zh-CN"}
-        )
-        
+        params = {"api_key": self.tmdb_api_key, "language": "zh-CN"}
+        season = media_data.get("season_number")
+        episode = media_data.get("episode_number")
+
+        # 剧集详情只依赖已知的 tv_id，与剧集信息请求并发执行
+        ep_data = None
+        if season and episode:
+            data, ep_data = await asyncio.gather(
+                self._http_get(url, params=params),
+                self._get_tmdb_episode_details(tv_id, season, episode),
+            )
+        else:
+            data = await self._http_get(url, params=params)
+
         if not data:
             data = await self._http_get(
                 url, params={"api_key": self.tmdb_api_key}
@@ -207,22 +273,16 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
                     "year": (data.get("first_air_date") or "")[:4],
                 }
             )
-            season = media_data.get("season_number")
-            episode = media_data.get("episode_number")
-            if season and episode:
-                ep_data = await self._get_tmdb_episode_details(
-                    data.get("id"), season, episode
+            if ep_data:
+                media_data.update(
+                    {
+                        "item_name": ep_data.get("name")
+                        or media_data.get("item_name"),
+                        "overview": ep_data.get("overview")
+                        or media_data.get("overview"),
+                        "tmdb_enriched": True,
+                    }
                 )
-                if ep_data:
-                    media_data.update(
-                        {
-                            "item_name": ep_data.get("name")
-                            or media_data.get("item_name"),
-                            "overview": ep_data.get("overview")
-                            or media_data.get("overview"),
-                            "tmdb_enriched": True,
-                        }
-                    )
         return media_data
 
     # --- 私有方法：搜索逻辑 ---
@@ -233,6 +293,11 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
         if not name:
             return media_data
 
+        miss_key = f"tmdb_search_movie_{name}_{year}"
+        if self._is_known_miss(miss_key):
+            logger.debug("TMDB 电影搜索近期未命中，跳过: %s", name)
+            return media_data
+
         search_url = f"{self.tmdb_base_url}/search/movie"
         params = {"api_key": self.tmdb_api_key, "query": name}
         if year:
@@ -243,6 +308,8 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             best_match = self._find_best_match(name, results["results"], "title")
             if best_match:
                 return await self._enrich_movie_by_id(media_data, best_match["id"])
+        elif results is not None:
+            self._set_miss(miss_key)
         return media_data
 
     async def _enrich_tv_by_search(self, media_data: dict) -> dict:
@@ -250,13 +317,18 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
         if not name:
             return media_data
 
+        miss_key = f"tmdb_search_tv_{name}"
+        if self._is_known_miss(miss_key):
+            logger.debug("TMDB 剧集搜索近期未命中，跳过: %s", name)
+            return media_data
+
         search_url = f"{self.tmdb_base_url}/search/tv"
         params = {"api_key": self.tmdb_api_key, "query": name}
         
         results = await self._http_get(search_url, params=params)
         
         if not (results and results.get("results")):
-            cleaned_name = re.sub(r'\d{4}$', '', name).strip()
+            cleaned_name = _TRAILING_YEAR_RE.sub("", name).strip()
             if cleaned_name and cleaned_name != name:
                  params["query"] = cleaned_name
                  results = await self._http_get(search_url, params=params)
@@ -265,7 +337,9 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             best_match = self._find_best_match(name, results["results"], "name")
             if best_match:
                 return await self._enrich_tv_by_id(media_data, best_match["id"])
-            
+        elif results is not None:
+            self._set_miss(miss_key)
+
         return media_data
 
     def _find_best_match(self, query: str, results: list, key: str) -> dict | None:
@@ -292,8 +366,8 @@ class TMDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
         """清理标题"""
         if not title:
             return ""
-        title = re.sub(r"\(.*?\)", "", title)
-        title = re.sub(r"[^\w\s\u4e00-\u9fa5]", "", title)
+        title = _PAREN_RE.sub("", title)
+        title = _PUNCT_RE.sub("", title)
         return title.lower().strip()
 
     async def _find_tmdb_id_by_external(
@@ -8,6 +8,7 @@ from typing import Any
 
 from astrbot.api import logger
 
+from ...utils import json_utils
 from .base_provider import BaseProvider, MediaEnrichmentProvider, MediaImageProvider
 
 
@@ -82,7 +83,7 @@ class TVDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             return media_data
 
         except Exception as e:
-            logger.error(f"TVDB 数据丰富出错: {e}")
+            logger.error("TVDB 数据丰富出错: %s", e)
             return media_data
 
     async def get_media_image(self, media_data: dict) -> str:
@@ -109,7 +110,7 @@ class TVDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
 
     async def _authenticate(self):
         """TVDB V4 认证"""
-        if self.jwt_token and time.time() < self.token_expires:
+        if self.jwt_token and time.monotonic() < self.token_expires:
             return
 
         if not self.api_key:
@@ -118,25 +119,27 @@ class TVDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
         auth_url = f"{self.base_url}/login"
         auth_data = {"apikey": self.api_key}
 
-        # 直接使用 aiohttp 避免 BaseProvider 的频率限制逻辑，因为这是初始化请求
+        # 直接发起请求，绕过 BaseProvider 的频率限制，因为这是初始化请求
+        # 会话开启了 raise_for_status，非 2xx 响应直接抛出
         try:
-            import aiohttp
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(auth_url, json=auth_data) as response:
-                    if response.status == 200:
-                        res_json = await response.json()
-                        self.jwt_token = res_json.get("data", {}).get("token", "")
-                        self.token_expires = time.time() + 24 * 3600 - 300
-                        logger.info("TVDB 认证成功")
+            session = await self._get_session()
+            async with session.post(
+                auth_url, json=auth_data, timeout=self.request_timeout
+            ) as response:
+                res_json = await response.json(loads=json_utils.loads)
+                self.jwt_token = res_json.get("data", {}).get("token", "")
+                self.token_expires = time.monotonic() + 24 * 3600 - 300
+                logger.info("TVDB 认证成功")
         except Exception as e:
-            logger.error(f"TVDB 认证失败: {e}")
+            logger.error("TVDB 认证失败: %s", e)
 
     async def _search_series(self, name: str) -> dict | None:
         cache_key = f"tvdb_search_{name}"
         cached = self._get_from_cache(cache_key)
         if cached:
             return cached
+        if self._is_known_miss(cache_key):
+            return None
 
         url = f"{self.base_url}/search"
         headers = {"Authorization": f"Bearer {self.jwt_token}"}
@@ -147,6 +150,8 @@ class TVDBProvider(MediaEnrichmentProvider, MediaImageProvider, BaseProvider):
             series = data["data"][0]
             self._set_cache(cache_key, series)
             return series
+        if data is not None:
+            self._set_miss(cache_key)
         return None
 
     async def _get_episode_details(
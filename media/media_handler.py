@@ -6,27 +6,41 @@
 import html
 import time
 import os
-import base64
 import random
+import re
 from pathlib import Path
 
 from astrbot.api import logger
 
+from ..utils.image_utils import load_data_url
 from .enrichment import EnrichmentManager
 from .processors import ProcessorManager
+from .processors.base_processor import MEDIA_TYPE_DISPLAY
+
+_BG_SUFFIXES = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+# 简介首句的结束位置：句号或换行
+_BREAK_RE = re.compile(r"[。\n]")
+# 各媒体类型的标题行，未知类型在生成时按原始类型名拼接
+_TITLE_BY_TYPE = {tp: f"新{cn}上线" for tp, cn in MEDIA_TYPE_DISPLAY.items()}
 
 
 class MediaHandler:
     def __init__(self, config: dict | None = None):
         self.processor_manager = ProcessorManager()
         self.enrichment_manager = EnrichmentManager(config)
+        # 校验使用的通用处理器，复用同一实例
+        self._generic_processor = self.processor_manager.get_processor("generic")
+        # 按媒体类型分派主体信息的生成方法，未列出的类型使用通用格式
+        self._section_builders = {"Episode": self._episode_section}
+        # 背景图目录列表缓存: (目录 mtime, 文件列表)，目录变化时重新扫描
+        self._bg_files: tuple[float, list[Path]] | None = None
 
     def detect_media_source(self, data: dict, headers: dict) -> str:
         """检测媒体通知来源"""
         try:
             return self.processor_manager.detect_source(data, headers)
         except Exception as e:
-            logger.error(f"媒体来源检测失败: {e}")
+            logger.error("媒体来源检测失败: %s", e)
             return "generic"
 
     async def process_media_data(
@@ -56,7 +70,7 @@ class MediaHandler:
             return self.create_message_payload(enriched_data, source)
 
         except Exception as e:
-            logger.error(f"处理媒体数据失败: {e}")
+            logger.error("处理媒体数据失败: %s", e)
             return self.create_fallback_payload(raw_data, source)
 
     def create_message_payload(self, media_data: dict, source: str) -> dict:
@@ -72,33 +86,42 @@ class MediaHandler:
     def generate_message_text(self, data: dict) -> str:
         """生成渲染文本内容"""
         tp = data.get("item_type", "")
-        parts = []
-        
-        processor = self.processor_manager.get_processor("generic")
-        cn_tp = processor.get_media_type_display(tp)
-        parts.append(f"新剧集上线" if tp == "Episode" else f"新{cn_tp}上线")
-
-        sn, itm, yr = data.get("series_name"), data.get("item_name"), data.get("year")
-        if tp == "Movie":
-            parts.append(f"名称: {itm or sn}{f' ({yr})' if yr else ''}")
-        elif tp == "Episode":
-            if sn: parts.append(f"剧集: {sn}{f' ({yr})' if yr else ''}")
-            s, e = data.get("season_number"), data.get("episode_number")
-            if s and e: parts.append(f"集号: S{str(s).zfill(2)}E{str(e).zfill(2)}")
-            if itm: parts.append(f"集名: {itm}")
-        else:
-            parts.append(f"名称: {itm or sn}{f' ({yr})' if yr else ''}")
+        parts = [_TITLE_BY_TYPE.get(tp) or f"新{tp}上线"]
+        self._section_builders.get(tp, self._item_section)(data, parts)
 
         ov = data.get("overview")
         if ov:
-            ov_clean = html.unescape(ov).split("\n")[0].split("。")[0]
-            parts.append(f"剧情: {ov_clean[:200]}...")
+            # 大多数简介不含 HTML 实体，跳过无谓的 unescape
+            if "&" in ov:
+                ov = html.unescape(ov)
+            # 只在前 200 字内查找断句位置，超出部分本就会被截断
+            m = _BREAK_RE.search(ov, 0, 200)
+            parts.append(f"剧情: {ov[:m.start() if m else 200]}...")
 
         if data.get("tmdb_enriched"): parts.append("[*] 数据来源: TMDB")
         elif data.get("bgm_enriched"): parts.append("[*] 数据来源: BGM.TV")
 
         return "\n".join(parts)
 
+    @staticmethod
+    def _episode_section(data: dict, parts: list[str]):
+        """剧集：剧名、集号与集名"""
+        sn, itm, yr = data.get("series_name"), data.get("item_name"), data.get("year")
+        if sn: parts.append(f"剧集: {sn} ({yr})" if yr else f"剧集: {sn}")
+        s, e = data.get("season_number"), data.get("episode_number")
+        if s and e:
+            try:
+                parts.append(f"集号: S{int(s):02d}E{int(e):02d}")
+            except (TypeError, ValueError):
+                parts.append(f"集号: S{str(s).zfill(2)}E{str(e).zfill(2)}")
+        if itm: parts.append(f"集名: {itm}")
+
+    @staticmethod
+    def _item_section(data: dict, parts: list[str]):
+        """其他类型：名称与年份"""
+        name, yr = data.get("item_name") or data.get("series_name"), data.get("year")
+        parts.append(f"名称: {name} ({yr})" if yr else f"名称: {name}")
+
     def create_fallback_payload(self, raw_data: dict, source: str) -> dict:
         return {
             "image_url": "",
@@ -119,15 +142,19 @@ class MediaHandler:
             bg_dir = Path(db_dir) / "media_bg"
             if not bg_dir.exists(): return ""
 
-            matches = [f for f in bg_dir.iterdir() if f.suffix.lower() in [".jpg", ".jpeg", ".png", ".webp"]]
+            mtime = bg_dir.stat().st_mtime
+            if self._bg_files is None or self._bg_files[0] != mtime:
+                files = [f for f in bg_dir.iterdir() if f.suffix.lower() in _BG_SUFFIXES]
+                self._bg_files = (mtime, files)
+            matches = self._bg_files[1]
             if not matches: return ""
             
-            selected = random.choice(matches)
-            with open(selected, "rb") as f:
-                b64 = base64.b64encode(f.read()).decode()
-                ext = selected.suffix.lower().replace(".", "").replace("jpg", "jpeg")
-                return f"data:image/{ext};base64,{b64}"
+            return load_data_url(random.choice(matches))
         except: return ""
 
+    async def close(self):
+        """释放数据丰富使用的网络资源"""
+        await self.enrichment_manager.close()
+
     def validate_media_data(self, media_data: dict) -> bool:
-        return self.processor_manager.get_processor("generic").validate_standard_data(media_data)
+        return self._generic_processor.validate_standard_data(media_data)
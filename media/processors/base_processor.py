@@ -6,10 +6,32 @@
 import html
 import re
 from abc import ABC, abstractmethod
+from types import MappingProxyType
 from typing import Any
 
 from astrbot.api import logger
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 媒体类型的显示名称，模块间共享，设为只读防止被意外修改
+MEDIA_TYPE_DISPLAY = MappingProxyType(
+    {
+        "Movie": "电影",
+        "Series": "剧集",
+        "Episode": "剧集",
+        "Season": "季",
+        "Audio": "音频",
+        "MusicVideo": "音乐视频",
+    }
+)
+
+
+def _to_str(value: Any) -> str:
+    """将可选值转换为字符串，空值返回空字符串，已是字符串时不再转换"""
+    if not value:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
 
 class BaseMediaProcessor(ABC):
     """基础媒体处理器抽象类"""
@@ -36,11 +58,12 @@ class BaseMediaProcessor(ABC):
         if not text:
             return ""
 
-        # HTML 解码
-        text = html.unescape(text)
+        # HTML 解码，不含实体时跳过
+        if "&" in text:
+            text = html.unescape(text)
 
         # 移除多余的空白字符
-        text = re.sub(r"\s+", " ", text).strip()
+        text = _WHITESPACE_RE.sub(" ", text).strip()
 
         return text
 
@@ -59,21 +82,12 @@ class BaseMediaProcessor(ABC):
                     return f"{runtime_minutes} 分钟"
             return ""
         except (TypeError, ValueError, ZeroDivisionError) as e:
-            logger.debug(f"时长转换失败: {e}, runtime_ticks={runtime_ticks}")
+            logger.debug("时长转换失败: %s, runtime_ticks=%s", e, runtime_ticks)
             return ""
 
     def get_media_type_display(self, item_type: str) -> str:
         """获取媒体类型的显示名称"""
-        # 简单的类型映射
-        type_map = {
-            "Movie": "电影",
-            "Series": "剧集",
-            "Episode": "剧集",
-            "Season": "季",
-            "Audio": "音频",
-            "MusicVideo": "音乐视频",
-        }
-        return type_map.get(item_type, item_type)
+        return MEDIA_TYPE_DISPLAY.get(item_type, item_type)
 
     def create_standard_data(self, **kwargs) -> dict:
         """创建标准格式的数据"""
@@ -81,13 +95,9 @@ class BaseMediaProcessor(ABC):
             "item_type": kwargs.get("item_type", "Unknown"),
             "series_name": kwargs.get("series_name", ""),
             "item_name": kwargs.get("item_name", ""),
-            "season_number": str(kwargs.get("season_number", ""))
-            if kwargs.get("season_number")
-            else "",
-            "episode_number": str(kwargs.get("episode_number", ""))
-            if kwargs.get("episode_number")
-            else "",
-            "year": str(kwargs.get("year", "")) if kwargs.get("year") else "",
+            "season_number": _to_str(kwargs.get("season_number")),
+            "episode_number": _to_str(kwargs.get("episode_number")),
+            "year": _to_str(kwargs.get("year")),
             "overview": kwargs.get("overview", ""),
             "runtime": kwargs.get("runtime", ""),
             "image_url": kwargs.get("image_url", ""),
@@ -102,7 +112,7 @@ class BaseMediaProcessor(ABC):
 
         if not (series_name or item_name):
             logger.error("媒体数据缺少名称信息")
-            logger.debug(f"series_name: '{series_name}', item_name: '{item_name}'")
+            logger.debug("series_name: '%s', item_name: '%s'", series_name, item_name)
             return False
 
         return True
@@ -32,8 +32,8 @@ class EmbyProcessor(BaseMediaProcessor):
         try:
             item = data.get("Item", {})
             event = data.get("Event", "")
-            logger.debug(f"Emby 原始数据结构: {data}")
-            logger.debug(f"Emby 事件类型: {event}")
+            logger.debug("Emby 原始数据结构: %s", data)
+            logger.debug("Emby 事件类型: %s", event)
 
             # 提取基本信息
             item_type = item.get("Type", "Unknown")
@@ -116,12 +116,12 @@ class EmbyProcessor(BaseMediaProcessor):
             if user and "Name" in user:
                 result["trigger_user"] = user["Name"]
 
-            logger.debug(f"Emby 转换结果: {result}")
+            logger.debug("Emby 转换结果: %s", result)
             return result
 
         except Exception as e:
-            logger.error(f"Emby 数据转换失败: {e}")
-            logger.debug(f"Emby 转换失败详情: {e}", exc_info=True)
+            logger.error("Emby 数据转换失败: %s", e)
+            logger.debug("Emby 转换失败详情: %s", e, exc_info=True)
             return {}
 
     def extract_emby_metadata(self, item: dict) -> dict:
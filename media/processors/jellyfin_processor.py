@@ -7,6 +7,10 @@ from astrbot.api import logger
 
 from .base_processor import BaseMediaProcessor
 
+# Jellyfin 载荷的特征字段
+_JELLYFIN_KEYS = frozenset({"ItemType", "SeriesName", "NotificationType", "ItemId"})
+_JELLYFIN_ITEM_KEYS = frozenset({"ItemType", "SeriesName", "ItemId"})
+
 
 class JellyfinProcessor(BaseMediaProcessor):
     """Jellyfin媒体处理器"""
@@ -14,16 +18,14 @@ class JellyfinProcessor(BaseMediaProcessor):
     def can_handle(self, data: dict, headers: dict | None = None) -> bool:
         """检查是否为Jellyfin数据"""
         # Jellyfin特征：包含ItemType或SeriesName字段，或者包含NotificationType
-        if any(
-            k in data for k in ["ItemType", "SeriesName", "NotificationType", "ItemId"]
-        ):
+        if not _JELLYFIN_KEYS.isdisjoint(data):
             logger.debug("检测到Jellyfin数据结构特征")
             return True
 
         # 检查嵌套结构
         if "Item" in data and isinstance(data["Item"], dict):
             item = data["Item"]
-            if any(k in item for k in ["ItemType", "SeriesName", "ItemId"]):
+            if not _JELLYFIN_ITEM_KEYS.isdisjoint(item):
                 return True
 
         # 检查User-Agent
@@ -38,7 +40,7 @@ class JellyfinProcessor(BaseMediaProcessor):
     def convert_to_standard(self, data: dict, headers: dict | None = None) -> dict:
         """将Jellyfin数据转换为标准格式"""
         try:
-            logger.debug(f"Jellyfin 原始数据结构: {data}")
+            logger.debug("Jellyfin 原始数据结构: %s", data)
 
             # 处理可能的包装结构 (Notification plugin)
             payload = data
@@ -88,7 +90,7 @@ class JellyfinProcessor(BaseMediaProcessor):
                     server_url = server_url.rstrip("/")
                     image_url = f"{server_url}/Items/{item_id}/Images/Primary"
 
-            logger.debug(f"Jellyfin 图片URL: {image_url}")
+            logger.debug("Jellyfin 图片URL: %s", image_url)
 
             result = self.create_standard_data(
                 item_type=item_type,
@@ -106,12 +108,12 @@ class JellyfinProcessor(BaseMediaProcessor):
             # 附加元数据
             result["metadata"] = self.extract_jellyfin_metadata(payload)
 
-            logger.debug(f"Jellyfin 转换结果: {result}")
+            logger.debug("Jellyfin 转换结果: %s", result)
             return result
 
         except Exception as e:
-            logger.error(f"Jellyfin 数据转换失败: {e}")
-            logger.debug(f"Jellyfin 转换失败详情: {e}", exc_info=True)
+            logger.error("Jellyfin 数据转换失败: %s", e)
+            logger.debug("Jellyfin 转换失败详情: %s", e, exc_info=True)
             return {}
 
     def extract_jellyfin_metadata(self, data: dict) -> dict:
@@ -7,6 +7,16 @@ from astrbot.api import logger
 
 from .base_processor import BaseMediaProcessor
 
+# Plex类型映射
+_PLEX_TYPE_MAP = {
+    "movie": "Movie",
+    "episode": "Episode",
+    "season": "Season",
+    "show": "Series",
+    "track": "Song",
+    "album": "Album",
+}
+
 
 class PlexProcessor(BaseMediaProcessor):
     """Plex媒体处理器"""
@@ -30,13 +40,13 @@ class PlexProcessor(BaseMediaProcessor):
     def convert_to_standard(self, data: dict, headers: dict | None = None) -> dict:
         """将Plex数据转换为标准格式"""
         try:
-            logger.debug(f"Plex 原始数据结构: {data}")
+            logger.debug("Plex 原始数据结构: %s", data)
 
             event = data.get("event", "")
             # 只处理感兴趣的事件类型 (比如 library.new 或 playback 开始)
             # 如果没有 event 字段，默认尝试处理 (为了兼容)
             if event and event not in ["library.new", "media.play", "media.scrobble"]:
-                logger.debug(f"忽略不感兴趣的 Plex 事件: {event}")
+                logger.debug("忽略不感兴趣的 Plex 事件: %s", event)
                 return {}
 
             metadata = data.get("Metadata", {})
@@ -46,16 +56,7 @@ class PlexProcessor(BaseMediaProcessor):
 
             # 提取基本信息
             raw_type = metadata.get("type", "episode")
-            # Plex类型映射
-            plex_type_map = {
-                "movie": "Movie",
-                "episode": "Episode",
-                "season": "Season",
-                "show": "Series",
-                "track": "Song",
-                "album": "Album",
-            }
-            item_type = plex_type_map.get(raw_type.lower(), raw_type.title())
+            item_type = _PLEX_TYPE_MAP.get(raw_type.lower(), raw_type.title())
 
             item_name = metadata.get("title", "")
 
@@ -118,7 +119,7 @@ class PlexProcessor(BaseMediaProcessor):
                     # 如果没有服务器信息，留给后续的数据丰富管理器去 TMDB 找
                     image_url = thumb
 
-            logger.debug(f"Plex 图片URL: {image_url}")
+            logger.debug("Plex 图片URL: %s", image_url)
 
             result = self.create_standard_data(
                 item_type=item_type,
@@ -137,12 +138,12 @@ class PlexProcessor(BaseMediaProcessor):
             result["metadata"] = self.extract_plex_metadata(metadata)
             result["plex_event"] = event
 
-            logger.debug(f"Plex 转换结果: {result}")
+            logger.debug("Plex 转换结果: %s", result)
             return result
 
         except Exception as e:
-            logger.error(f"Plex 数据转换失败: {e}")
-            logger.debug(f"Plex 转换失败详情: {e}", exc_info=True)
+            logger.error("Plex 数据转换失败: %s", e)
+            logger.debug("Plex 转换失败详情: %s", e, exc_info=True)
             return {}
 
     def extract_plex_metadata(self, metadata: dict) -> dict:
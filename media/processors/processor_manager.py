@@ -13,6 +13,13 @@ from .generic_processor import GenericProcessor
 from .jellyfin_processor import JellyfinProcessor
 from .plex_processor import PlexProcessor
 
+_PROCESSOR_MAP = {
+    "emby": EmbyProcessor,
+    "jellyfin": JellyfinProcessor,
+    "plex": PlexProcessor,
+    "generic": GenericProcessor,
+}
+
 
 class ProcessorManager:
     """媒体处理器管理器"""
@@ -27,7 +34,7 @@ class ProcessorManager:
         ]
 
         logger.info("媒体处理器管理器初始化完成")
-        logger.info(f"已注册处理器: {[p.__class__.__name__ for p in self.processors]}")
+        logger.info("已注册处理器: %s", [p.__class__.__name__ for p in self.processors])
 
     def detect_source(self, data: dict, headers: dict | None = None) -> str:
         """检测数据源类型"""
@@ -35,30 +42,23 @@ class ProcessorManager:
             for processor in self.processors:
                 if processor.can_handle(data, headers):
                     source_name = processor.get_source_name()
-                    logger.debug(f"检测到数据源: {source_name}")
+                    logger.debug("检测到数据源: %s", source_name)
                     return source_name
 
             logger.warning("未能检测到数据源，使用通用处理器")
             return "generic"
 
         except Exception as e:
-            logger.error(f"数据源检测失败: {e}")
+            logger.error("数据源检测失败: %s", e)
             return "generic"
 
     def get_processor(self, source: str) -> BaseMediaProcessor | None:
         """根据源类型获取对应的处理器"""
-        processor_map = {
-            "emby": EmbyProcessor,
-            "jellyfin": JellyfinProcessor,
-            "plex": PlexProcessor,
-            "generic": GenericProcessor,
-        }
-
-        processor_class = processor_map.get(source.lower())
+        processor_class = _PROCESSOR_MAP.get(source.lower())
         if processor_class:
             return processor_class()
 
-        logger.warning(f"未找到源 '{source}' 的处理器，使用通用处理器")
+        logger.warning("未找到源 '%s' 的处理器，使用通用处理器", source)
         return GenericProcessor()
 
     def convert_to_standard(
@@ -73,29 +73,29 @@ class ProcessorManager:
             # 获取对应的处理器
             processor = self.get_processor(source)
             if not processor:
-                logger.error(f"无法获取源 '{source}' 的处理器")
+                logger.error("无法获取源 '%s' 的处理器", source)
                 return {}
 
-            logger.debug(f"使用 {processor.__class__.__name__} 处理数据")
+            logger.debug("使用 %s 处理数据", processor.__class__.__name__)
 
             # 转换数据
             result = processor.convert_to_standard(data, headers)
 
             if not result:
-                logger.warning(f"{source} 数据转换失败")
+                logger.warning("%s 数据转换失败", source)
                 return {}
 
             # 验证转换结果
             if not processor.validate_standard_data(result):
-                logger.error(f"{source} 数据验证失败")
+                logger.error("%s 数据验证失败", source)
                 return {}
 
-            logger.info(f"{source} 数据转换成功")
+            logger.info("%s 数据转换成功", source)
             return result
 
         except Exception as e:
-            logger.error(f"数据转换处理出错: {e}")
-            logger.debug(f"数据转换失败详情: {e}", exc_info=True)
+            logger.error("数据转换处理出错: %s", e)
+            logger.debug("数据转换失败详情: %s", e, exc_info=True)
             return {}
 
     def get_processor_info(self) -> dict[str, Any]:
@@ -156,15 +156,15 @@ class ProcessorManager:
         else:
             self.processors.insert(priority, processor)
 
-        logger.info(f"已添加自定义处理器: {processor.__class__.__name__}")
+        logger.info("已添加自定义处理器: %s", processor.__class__.__name__)
 
     def remove_processor(self, processor_name: str) -> bool:
         """移除指定处理器"""
         for i, processor in enumerate(self.processors):
             if processor.__class__.__name__ == processor_name:
                 self.processors.pop(i)
-                logger.info(f"已移除处理器: {processor_name}")
+                logger.info("已移除处理器: %s", processor_name)
                 return True
 
-        logger.warning(f"未找到处理器: {processor_name}")
+        logger.warning("未找到处理器: %s", processor_name)
         return False
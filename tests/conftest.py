@@ -0,0 +1,42 @@
+"""
+测试环境配置
+未安装 AstrBot 时提供最小的 astrbot.api 模块，被测模块只依赖其中的 logger
+"""
+
+import logging
+import sys
+import time
+import types
+
+import pytest
+
+try:
+    import astrbot.api  # noqa: F401
+except ImportError:
+    _astrbot = types.ModuleType("astrbot")
+    _api = types.ModuleType("astrbot.api")
+    _api.logger = logging.getLogger("astrbot")
+    _astrbot.api = _api
+    sys.modules["astrbot"] = _astrbot
+    sys.modules["astrbot.api"] = _api
+
+
+class FakeClock:
+    """可手动推进的时钟替身"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """替换缓存过期判断使用的时钟"""
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
@@ -0,0 +1,200 @@
+"""MediaDataProcessor 去重逻辑测试"""
+
+import asyncio
+import hashlib
+import json
+
+import pytest
+
+from ..media import data_processor
+from ..media.data_processor import MediaDataProcessor
+
+
+
+class FakeMediaHandler:
+    """只实现去重流程用到的方法，记录处理次数"""
+
+    def __init__(self):
+        self.processed = 0
+
+    def detect_media_source(self, data: dict, headers: dict) -> str:
+        return "emby"
+
+    async def process_media_data(self, raw_data: dict, source: str, headers: dict):
+        self.processed += 1
+        return {
+            "image_url": f"https://img.example/{self.processed}.jpg",
+            "message_text": f"新剧集上线\n剧集: {raw_data['name']}",
+            "source": source,
+            "media_data": {"item_type": "Episode", "series_name": raw_data["name"]},
+            "timestamp": float(self.processed),
+        }
+
+    def validate_media_data(self, media_data: dict) -> bool:
+        return bool(media_data)
+
+
+def _payload(text: str) -> dict:
+    return {"message_text": text, "image_url": "https://img", "timestamp": 1.0}
+
+
+def _raw_msg(body: dict | str) -> dict:
+    text = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+    return {"raw_data": text, "headers": {"Content-Type": "application/json"}}
+
+
+def _process(processor: MediaDataProcessor, body: dict | str) -> dict | None:
+    return asyncio.run(processor.detect_and_process_raw_data(_raw_msg(body)))
+
+
+def test_standard_hash_ignores_unstable_fields():
+    digest = MediaDataProcessor(FakeMediaHandler()).calculate_standard_hash
+    base = {"message_text": "x", "media_data": {"item_name": "A", "year": 2024}}
+    noisy = {**base, "image_url": "https://img", "timestamp": 1.0}
+    reordered = {"media_data": {"year": 2024, "item_name": "A"}, "message_text": "x"}
+
+    assert digest(base) == digest(noisy) == digest(reordered)
+    assert digest(base) != digest({**base, "message_text": "y"})
+
+
+def test_hashes_are_128_bit_blake2b():
+    processor = MediaDataProcessor(FakeMediaHandler())
+
+    assert data_processor._hash_bytes(b"body") == (
+        hashlib.blake2b(b"body", digest_size=16).hexdigest()
+    )
+    assert len(processor.calculate_standard_hash({"message_text": "x"})) == 32
+
+
+def test_request_is_recorded_and_expires(clock):
+    processor = MediaDataProcessor(FakeMediaHandler(), cache_ttl_seconds=300)
+
+    assert processor.is_duplicate_request(_payload("a")) is False
+    assert processor.is_duplicate_request(_payload("a")) is True
+
+    clock.advance(301)
+    assert processor.is_duplicate_request(_payload("a")) is False
+
+
+def test_cleanup_pops_only_expired_head_entries(clock):
+    processor = MediaDataProcessor(FakeMediaHandler(), cache_ttl_seconds=10)
+    processor.is_duplicate_request(_payload("old"))
+    clock.advance(5)
+    processor.is_duplicate_request(_payload("new"))
+
+    clock.advance(6)
+    processor.cleanup_expired_cache(clock())
+
+    assert list(processor.request_cache) == [
+        processor.calculate_request_hash(_payload("new"))
+    ]
+
+
+def test_cache_is_capped_and_evicts_oldest(clock):
+    processor = MediaDataProcessor(FakeMediaHandler(), cache_max_entries=2)
+    for text in ("a", "b", "c"):
+        processor.is_duplicate_request(_payload(text))
+
+    assert len(processor.request_cache) == 2
+    assert processor.is_duplicate_request(_payload("a")) is False
+
+
+def test_empty_hash_is_never_duplicate():
+    processor = MediaDataProcessor(FakeMediaHandler())
+    assert processor.is_duplicate_hash("") is False
+    assert processor.is_duplicate_hash("") is False
+    assert not processor.request_cache
+
+
+def test_body_hash_is_recorded_with_request(clock):
+    processor = MediaDataProcessor(FakeMediaHandler(), cache_ttl_seconds=300)
+
+    assert processor.is_duplicate_raw("raw-a") is False
+    assert processor.is_duplicate_request(_payload("a"), body_hash="raw-a") is False
+    assert processor.is_duplicate_raw("raw-a") is True
+
+    clock.advance(301)
+    assert processor.is_duplicate_raw("raw-a") is False
+
+
+def test_identical_body_is_dropped_before_processing():
+    handler = FakeMediaHandler()
+    processor = MediaDataProcessor(handler)
+    body = {"name": "Show"}
+
+    first = _process(processor, body)
+    second = _process(processor, body)
+
+    assert first["message_type"] == "media"
+    assert second is None
+    assert handler.processed == 1
+
+
+def test_semantic_duplicate_with_different_body_is_dropped():
+    handler = FakeMediaHandler()
+    processor = MediaDataProcessor(handler)
+
+    first = _process(processor, '{"name": "Show"}')
+    # 请求体不同 (空白与多余字段)，处理后的语义内容相同
+    second = _process(processor, '{"name":"Show","extra":1}')
+
+    assert first is not None
+    assert second is None
+    assert handler.processed == 2
+    # 原始请求体与语义哈希共用同一个缓存
+    assert len(processor.request_cache) == 2
+
+
+def test_large_body_hashes_in_thread(monkeypatch):
+    calls = []
+    to_thread = asyncio.to_thread
+
+    async def spy(func, *args):
+        calls.append(func)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(data_processor.asyncio, "to_thread", spy)
+    handler = FakeMediaHandler()
+    processor = MediaDataProcessor(handler)
+    body = {"name": "Show", "padding": "x" * (data_processor._OFFLOAD_HASH_SIZE + 1)}
+
+    assert _process(processor, body)
+    assert _process(processor, body) is None
+    # 首次: 请求体哈希 + 语义哈希；重发: 只计算请求体哈希
+    assert len(calls) == 3
+    assert handler.processed == 1
+
+
+def test_small_body_hashes_inline(monkeypatch):
+    async def fail(*args):
+        raise AssertionError("小请求体不应放到线程中计算哈希")
+
+    monkeypatch.setattr(data_processor.asyncio, "to_thread", fail)
+    processor = MediaDataProcessor(FakeMediaHandler())
+
+    assert _process(processor, {"name": "A"})
+
+
+@pytest.mark.parametrize("kwargs", [{"dedup_enabled": False}, {"cache_ttl_seconds": 0}])
+def test_dedup_disabled_skips_hashing(monkeypatch, kwargs):
+    def fail(*args):
+        raise AssertionError("关闭去重时不应计算哈希")
+
+    monkeypatch.setattr(data_processor, "_hash_bytes", fail)
+    monkeypatch.setattr(MediaDataProcessor, "calculate_request_hash", fail)
+    handler = FakeMediaHandler()
+    processor = MediaDataProcessor(handler, **kwargs)
+    body = {"name": "Show"}
+
+    assert _process(processor, body)
+    assert _process(processor, body)
+    assert handler.processed == 2
+    assert not processor.request_cache
+
+
+def test_invalid_json_is_rejected_without_processing():
+    handler = FakeMediaHandler()
+    processor = MediaDataProcessor(handler)
+
+    assert _process(processor, "{bad") is None
+    assert handler.processed == 0
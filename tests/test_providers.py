@@ -0,0 +1,240 @@
+"""提供者缓存、未命中缓存与并发请求合并测试"""
+
+import asyncio
+
+from ..media.enrichment import base_provider, tmdb_provider
+from ..media.enrichment.base_provider import BaseProvider
+from ..media.enrichment.tmdb_provider import TMDBProvider
+
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self, loads=None):
+        return self._data
+
+
+class FakeSession:
+    """按 URL 返回预设数据，记录请求参数"""
+
+    def __init__(self, responses: dict):
+        self.responses = responses
+        self.requests: list[tuple[str, dict]] = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append((url, params))
+        return FakeResponse(self.responses[url])
+
+
+def _tmdb_with(session: FakeSession) -> TMDBProvider:
+    provider = TMDBProvider("secret-key")
+    provider.request_interval = 0
+
+    async def get_session():
+        return session
+
+    provider.session_getter = get_session
+    return provider
+
+
+def test_cache_expires_after_ttl(clock):
+    provider = BaseProvider(cache_ttl=60)
+    provider._set_cache("k", {"v": 1})
+
+    clock.advance(59)
+    assert provider._get_from_cache("k") == {"v": 1}
+    clock.advance(2)
+    assert provider._get_from_cache("k") is None
+    assert "k" not in provider.cache
+
+
+def test_cache_entry_ttl_overrides_default(clock):
+    provider = BaseProvider(cache_ttl=3600)
+    provider._set_cache("short", 1, ttl=10)
+    provider._set_cache("long", 2)
+
+    clock.advance(11)
+    assert provider._get_from_cache("short") is None
+    assert provider._get_from_cache("long") == 2
+
+
+def test_cache_is_capped(monkeypatch, clock):
+    monkeypatch.setattr(base_provider, "_CACHE_MAX_ENTRIES", 2)
+    provider = BaseProvider()
+    for key in ("a", "b", "c"):
+        provider._set_cache(key, key)
+
+    assert list(provider.cache) == ["b", "c"]
+
+
+def test_miss_expires_after_ttl(clock):
+    provider = BaseProvider(miss_cache_ttl=100)
+    provider._set_miss("k")
+
+    clock.advance(99)
+    assert provider._is_known_miss("k") is True
+    clock.advance(2)
+    assert provider._is_known_miss("k") is False
+    assert not provider.miss_cache
+
+
+def test_set_cache_clears_known_miss(clock):
+    provider = BaseProvider()
+    provider._set_miss("k")
+    provider._set_cache("k", 1)
+
+    assert provider._is_known_miss("k") is False
+
+
+def test_miss_cache_is_capped(monkeypatch, clock):
+    monkeypatch.setattr(base_provider, "_MISS_CACHE_MAX_ENTRIES", 2)
+    provider = BaseProvider()
+    for key in ("a", "b", "c"):
+        provider._set_miss(key)
+
+    assert list(provider.miss_cache) == ["b", "c"]
+    assert provider._is_known_miss("a") is False
+
+
+def test_single_flight_shares_one_call():
+    provider = BaseProvider()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def main():
+        return await asyncio.gather(
+            *(provider._single_flight("k", fetch) for _ in range(5))
+        )
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert results == [{"id": 1}] * 5
+    assert not provider._inflight
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    provider = BaseProvider()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            *(provider._single_flight("k", fetch) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not provider._inflight
+
+
+def test_tmdb_cache_key_excludes_api_key():
+    url = "https://api.themoviedb.org/3/tv/1"
+    session = FakeSession({url: {"id": 1, "overview": "简介"}})
+    provider = _tmdb_with(session)
+
+    async def main():
+        for key in ("secret-key", "rotated-key"):
+            data = await provider._http_get(
+                url, params={"api_key": key, "language": "zh-CN"}
+            )
+        return data
+
+    assert asyncio.run(main()) == {"id": 1, "overview": "简介"}
+    assert len(session.requests) == 1
+    assert all("secret-key" not in key for key in provider.cache)
+
+
+def test_tmdb_concurrent_requests_are_coalesced():
+    url = "https://api.themoviedb.org/3/movie/1"
+    session = FakeSession({url: {"id": 1, "overview": "简介"}})
+    provider = _tmdb_with(session)
+
+    async def main():
+        return await asyncio.gather(
+            *(provider._http_get(url, params={"api_key": "k"}) for _ in range(5))
+        )
+
+    assert len(asyncio.run(main())) == 5
+    assert len(session.requests) == 1
+
+
+def test_tmdb_empty_overview_uses_short_ttl(clock):
+    empty = "https://api.themoviedb.org/3/tv/1/season/1/episode/1"
+    full = "https://api.themoviedb.org/3/tv/1/season/1/episode/2"
+    session = FakeSession({empty: {"overview": ""}, full: {"overview": "简介"}})
+    provider = _tmdb_with(session)
+
+    async def fetch_both():
+        await provider._http_get(empty)
+        await provider._http_get(full)
+
+    asyncio.run(fetch_both())
+    clock.advance(tmdb_provider._EMPTY_DETAIL_TTL + 1)
+    asyncio.run(fetch_both())
+
+    assert [url for url, _ in session.requests] == [empty, full, empty]
+
+
+def test_tmdb_image_search_keeps_response_cache():
+    # 搜索接口无结果时 FakeSession 抛出 KeyError，按请求失败处理
+    provider = _tmdb_with(FakeSession({}))
+    provider._set_cache("cached", {"id": 1})
+
+    image = asyncio.run(provider.get_image({"item_type": "Movie", "item_name": "X"}))
+
+    assert image == ""
+    assert provider._get_from_cache("cached") == {"id": 1}
+
+
+def _episode_with_failing_fanart(still_path: str | None) -> tuple[TMDBProvider, dict]:
+    provider = TMDBProvider("secret-key", fanart_api_key="fanart-key")
+
+    async def episode_details(tmdb_id, season, episode):
+        await asyncio.sleep(0.01)
+        return {"still_path": still_path}
+
+    async def fanart(media_data):
+        raise RuntimeError("fanart down")
+
+    provider._get_tmdb_episode_details = episode_details
+    provider._get_fanart_image = fanart
+    media_data = {
+        "item_type": "Episode",
+        "tmdb_tv_id": 1,
+        "season_number": "1",
+        "episode_number": "2",
+        "poster_path": "/poster.jpg",
+    }
+    return provider, media_data
+
+
+def test_tmdb_image_keeps_still_when_fanart_fails():
+    provider, media_data = _episode_with_failing_fanart("/still.jpg")
+
+    image = asyncio.run(provider.get_image(media_data))
+
+    assert image == "https://image.tmdb.org/t/p/w500/still.jpg"
+
+
+def test_tmdb_image_falls_back_to_poster_when_fanart_fails():
+    provider, media_data = _episode_with_failing_fanart(None)
+
+    image = asyncio.run(provider.get_image(media_data))
+
+    assert image == "https://image.tmdb.org/t/p/w500/poster.jpg"
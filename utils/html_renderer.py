@@ -30,7 +30,7 @@ class HtmlRenderer:
                 with open(fonts_base64_dir / "SourceHanSansCN-Bold.txt", "r") as f:
                     self._font_cache["bold"] = f.read().strip()
         except Exception as e:
-            logger.warning(f"读取内嵌字体失败: {e}")
+            logger.warning("读取内嵌字体失败: %s", e)
 
     async def render(
         self, text: str, image_url: str = None, template_name: str = "css_news_card.html"
@@ -39,26 +39,22 @@ class HtmlRenderer:
         self._load_fonts()
         
         # Parse text into title and items
-        lines = text.strip().split("\n")
-        title = lines[0] if lines else ""
+        title, _, body = text.strip().partition("\n")
         items = []
 
-        for line in lines[1:]:
+        for line in body.split("\n"):
             line = line.strip()
             if not line:
                 continue
 
             # Simple heuristic for key-value pairs
-            if "：" in line:
-                parts = line.split("：", 1)
-                items.append(
-                    {"type": "kv", "label": parts[0] + "：", "value": parts[1].strip()}
-                )
-            elif ":" in line:
-                parts = line.split(":", 1)
-                items.append(
-                    {"type": "kv", "label": parts[0] + ":", "value": parts[1].strip()}
-                )
+            for sep in ("：", ":"):
+                label, found, value = line.partition(sep)
+                if found:
+                    items.append(
+                        {"type": "kv", "label": label + sep, "value": value.strip()}
+                    )
+                    break
             else:
                 items.append({"type": "text", "text": line})
 
@@ -0,0 +1,44 @@
+"""
+图片工具
+将本地图片读取为 base64 data URL，并按文件缓存编码结果
+"""
+
+import base64
+from collections import OrderedDict
+from pathlib import Path
+
+# 仅缓存不超过该大小的图片，大图每次重新读取，避免常驻内存
+_CACHE_MAX_FILE_SIZE = 512 * 1024
+# 缓存的文件数上限，超出时淘汰最久未使用的文件
+_CACHE_MAX_ENTRIES = 16
+
+# 路径 -> (mtime, data URL)，每个路径只保留最新的一份编码结果
+_cache: OrderedDict[Path, tuple[float, str]] = OrderedDict()
+
+
+def _encode_file(path: Path) -> str:
+    ext = path.suffix.lower().lstrip(".")
+    if ext == "jpg":
+        ext = "jpeg"
+    b64 = base64.b64encode(path.read_bytes()).decode()
+    return f"data:image/{ext};base64,{b64}"
+
+
+def load_data_url(path: Path) -> str:
+    """读取本地图片为 data URL，小图未修改时直接复用上次的编码结果"""
+    stat = path.stat()
+    entry = _cache.get(path)
+    if entry is not None and entry[0] == stat.st_mtime:
+        _cache.move_to_end(path)
+        return entry[1]
+
+    data_url = _encode_file(path)
+    if stat.st_size <= _CACHE_MAX_FILE_SIZE:
+        # 文件被替换时覆盖同一路径的旧条目
+        _cache[path] = (stat.st_mtime, data_url)
+        _cache.move_to_end(path)
+        if len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    else:
+        _cache.pop(path, None)
+    return data_url
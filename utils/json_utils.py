@@ -0,0 +1,27 @@
+"""
+JSON 工具
+优先使用 orjson 加速解析，未安装时回退到标准库 json
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def loads(data: str | bytes):
+    """解析 JSON 文本，解析失败抛出 json.JSONDecodeError (orjson 的异常为其子类)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_sorted(obj) -> bytes:
+    """按键排序序列化为 UTF-8 字节，用于计算稳定的哈希"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        )
+    return json.dumps(obj, sort_keys=True, default=str).encode()
@@ -7,14 +7,24 @@ import json
 import random
 import time
 import re
+from collections.abc import Awaitable, Callable
+
 import aiohttp
 from astrbot.api import logger
 
+from . import json_utils
+
+_CJK_RE = re.compile(r"[\u4e00-\u9fa5]")
+
+
 class Translator:
     def __init__(self, config: dict):
         self.config = config
         self.enable = config.get("enable_translation", False)
         self.preferred = config.get("preferred_translator", "google")
+        # 由管理器注入的共享会话获取函数，未注入时使用自有会话
+        self.session_getter: Callable[[], Awaitable[aiohttp.ClientSession]] | None = None
+        self._session: aiohttp.ClientSession | None = None
         
     async def translate(self, text: str, target_lang: str = "zh") -> str:
         """翻译入口"""
@@ -41,13 +51,28 @@ class Translator:
                 if result and result != text:
                     return result
             except Exception as e:
-                logger.debug(f"{t} 翻译失败: {e}")
+                logger.debug("%s 翻译失败: %s", t, e)
                 
         return text
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取 HTTP 会话，优先使用注入的共享会话"""
+        if self.session_getter is not None:
+            return await self.session_getter()
+        if self._session is None or self._session.closed:
+            # 与共享会话一致，非 2xx 响应抛出异常，由 translate 统一处理
+            self._session = aiohttp.ClientSession(raise_for_status=True)
+        return self._session
+
+    async def close(self):
+        """关闭自有的 HTTP 会话"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     def _is_chinese(self, text: str) -> bool:
         """判断是否包含中文"""
-        return bool(re.search(r'[\u4e00-\u9fa5]', text))
+        return bool(_CJK_RE.search(text))
 
     async def _google_translate(self, text: str, target: str) -> str:
         """Google 免费翻译接口 (备用)"""
@@ -59,12 +84,10 @@ class Translator:
             "dt": "t",
             "q": text
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return "".join([s[0] for s in data[0] if s[0]])
-        return ""
+        session = await self._get_session()
+        async with session.get(url, params=params) as resp:
+            data = await resp.json(loads=json_utils.loads)
+        return "".join([s[0] for s in data[0] if s[0]])
 
     async def _tencent_translate(self, text: str, target: str) -> str:
         """腾讯翻译 API"""
@@ -88,10 +111,9 @@ class Translator:
             "q": text, "from": "auto", "to": target,
             "appid": app_id, "salt": salt, "sign": sign
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if "trans_result" in data:
-                        return "\n".join([r["dst"] for r in data["trans_result"]])
+        session = await self._get_session()
+        async with session.get(url, params=params) as resp:
+            data = await resp.json(loads=json_utils.loads)
+        if "trans_result" in data:
+            return "\n".join([r["dst"] for r in data["trans_result"]])
         return ""